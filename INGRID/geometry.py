@@ -17,8 +17,8 @@ import matplotlib.pyplot as plt
 import sys
 import linecache
 from matplotlib.patches import Polygon
-from scipy.optimize import fsolve, curve_fit, root_scalar, brentq
-from scipy.interpolate import splprep, splev
+from scipy.optimize import fsolve, brentq
+from scipy.interpolate import splprep, splev, make_interp_spline
 from collections import OrderedDict
 
 
@@ -110,10 +110,12 @@ class Point:
     """
 
     def __init__(self, *pts):
-        if np.shape(pts) == (2,):
+        # Dispatch on len() rather than np.shape, which converts the
+        # arguments to an array on every Point construction.
+        if len(pts) == 2:
             self.x, self.y = float(pts[0]), float(pts[1])
             self.coor = (self.x, self.y)
-        elif np.shape(pts) == (1, 2):
+        elif len(pts) == 1 and hasattr(pts[0], '__len__') and len(pts[0]) == 2:
             self.x, self.y = float(pts[0][0]), float(pts[0][1])
             self.coor = (self.x, self.y)
         else:
@@ -279,15 +281,19 @@ class Line:
         """
         if verbose is True:
             print(f'# Fluffing with n = {num}')
-        x_fluff = np.empty(0)
-        y_fluff = np.empty(0)
         if verbose is True:
             print(f'# fluff: len(self.xval) = {len(self.xval)}')
-        for i in range(len(self.xval) - 1):
-            x_fluff = np.append(x_fluff, np.linspace(self.xval[i], self.xval[i + 1], num, endpoint=False))
-            y_fluff = np.append(y_fluff, np.linspace(self.yval[i], self.yval[i + 1], num, endpoint=False))
-        x_fluff = np.append(x_fluff, self.xval[-1])
-        y_fluff = np.append(y_fluff, self.yval[-1])
+        xval = np.asarray(self.xval, dtype=float)
+        yval = np.asarray(self.yval, dtype=float)
+        # Fill num samples per segment in segment order straight into the
+        # output, then close the Line with its last point.
+        n = len(xval) - 1
+        x_fluff = np.empty(n * num + 1)
+        y_fluff = np.empty(n * num + 1)
+        x_fluff[:-1].reshape(n, num)[...] = np.linspace(xval[:-1], xval[1:], num, endpoint=False, axis=1)
+        y_fluff[:-1].reshape(n, num)[...] = np.linspace(yval[:-1], yval[1:], num, endpoint=False, axis=1)
+        x_fluff[-1] = xval[-1]
+        y_fluff[-1] = yval[-1]
 
         return x_fluff, y_fluff
 
@@ -461,8 +467,8 @@ class Cell:
         self.vertices = {'NW': N.p[0], 'NE': N.p[-1],
                          'SW': S.p[0], 'SE': S.p[-1]}
 
-        self.center = Point((np.mean([p.x for p in [self.vertices[coor] for coor in ['NW', 'NE', 'SE', 'SW']]]),
-                             np.mean([p.y for p in [self.vertices[coor] for coor in ['NW', 'NE', 'SE', 'SW']]])))
+        NW, NE, SE, SW = N.p[0], N.p[-1], S.p[-1], S.p[0]
+        self.center = Point(((NW.x + NE.x + SE.x + SW.x) / 4, (NW.y + NE.y + SE.y + SW.y) / 4))
 
         self.vertices.update({'CENTER': self.center})
 
@@ -566,6 +572,7 @@ class Patch:
         self.S = lines[2]
         self.W = lines[3]
         self.BoundaryPoints = {}
+        self._boundary_splines = None
 
         # This is the border for the fill function
         # It need to only include N and S lines
@@ -705,6 +712,19 @@ class Patch:
             cg_np = np.array(cg_np)
         return cg_np
 
+    def cell_grid_as_rz(self) -> np.ndarray:
+        """
+        Get the vertex coordinates of the refined cell grid as an array.
+
+        Returns
+        -------
+            An ndarray with shape (nrad - 1, npol - 1, 5, 2). The third axis
+            holds the CENTER, SW, SE, NW, and NE vertices of each cell and
+            the last axis their (R, Z) coordinates.
+        """
+        corners = ['CENTER', 'SW', 'SE', 'NW', 'NE']
+        return np.array([[[cell.vertices[coor].coor for coor in corners] for cell in row] for row in self.cell_grid])
+
     def as_np(self):
 
         patch_data = []
@@ -740,15 +760,44 @@ class Patch:
             list of values to parameterize a spline
             in Psi. Returns a list to be used for splprep only
             """
-            vmax = grid.PsiNorm.get_psi(r[-1], z[-1])
-            vmin = grid.PsiNorm.get_psi(r[0], z[0])
+            vcurr = grid.PsiNorm.get_psi_vec(np.asarray(r), np.asarray(z))
+            vmin = vcurr[0]
+            vmax = vcurr[-1]
 
-            vparameterization = np.empty(0)
-            for i in range(len(r)):
-                vcurr = grid.PsiNorm.get_psi(r[i], z[i])
-                vparameterization = np.append(vparameterization, abs((vcurr - vmin) / (vmax - vmin)))
+            return abs((vcurr - vmin) / (vmax - vmin))
 
-            return vparameterization
+        def spline_points(u, spl):
+            """
+            Evaluate a spline at all parameter values in u at once and
+            return the result as a list of Points.
+            """
+            _x, _y = splev(u, spl)
+            return [Point((float(x), float(y))) for x, y in zip(_x, _y)]
+
+        def interp_spline(vals, u=None):
+            """
+            Cubic spline interpolating the points in vals, returned in the
+            (tck, u) form of splprep(..., s=0). The knots are the ones FITPACK
+            would choose, but the coefficients come from a single banded solve.
+            """
+            x = np.asarray(vals[0], dtype=float)
+            y = np.asarray(vals[1], dtype=float)
+            if u is None:
+                u = np.concatenate(([0.], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+                u = u / u[-1]
+            try:
+                spl = make_interp_spline(u, np.column_stack((x, y)), k=3)
+            except ValueError:
+                # Repeated parameter values: leave them to FITPACK as before.
+                return splprep([x, y], u=u, s=0)
+            return (spl.t, [np.ascontiguousarray(spl.c[:, 0]), np.ascontiguousarray(spl.c[:, 1])], 3), u
+
+        def transform(f, n):
+            """
+            Apply a grid transformation to n evenly spaced values in [0, 1].
+            """
+            s = np.arange(n) / (n - 1)
+            return np.broadcast_to(np.asarray(f(s), dtype=float), s.shape)
 
         def psi_test(leg, grid):
             """
@@ -786,43 +835,59 @@ class Patch:
             print(nr_cells)
         np_lines = np_cells + 1
         nr_lines = nr_cells + 1
-        if verbose: print(' # Create B-Splines along the North and South boundaries.')
-        # Create B-Splines along the North and South boundaries.
-        N_vals = self.N.fluff()
-
-        self.N_spl, uN = splprep([N_vals[0], N_vals[1]], s=0)
-        # Reverse the orientation of the South line to line up with the North.
-
-        S_vals = self.S.reverse_copy().fluff()
-        self.S_spl, uS = splprep([S_vals[0], S_vals[1]], s=0)
-        if verbose: print(' # Create B-Splines along West boundaries.')
-        # Create B-Splines along the East and West boundaries.
-        # Parameterize EW splines in Psi
-        try:
-            #Cannot fluff with too many points
-            n = 500 if len(self.W.p) < 50 else 100
-           # W_vals = self.W.reverse_copy().fluff(num = n)
-            W_vals = self.W.reverse_copy().fluff(n, verbose=verbose)
-            Psi = psi_parameterize(grid, W_vals[0], W_vals[1])
-            self.W_spl, uW = splprep([W_vals[0], W_vals[1]], u=Psi, s=10)
-        except Exception as e:
-            exc_type, exc_obj, tb = sys.exc_info()
-            f = tb.tb_frame
-            lineno = tb.tb_lineno
-            filename = f.f_code.co_filename
-            linecache.checkcache(filename)
-            line = linecache.getline(filename, lineno, f.f_globals)
-            print('EXCEPTION IN ({}, LINE {} "{}"): {}'.format(filename, lineno, line.strip(), exc_obj))
-
-        if verbose: print(' # Create B-Splines along the East boundaries.')
-        try:
-            n = 500 if len(self.E.p) < 50 else 100
-            E_vals = self.E.fluff(num=n)
-            self.E_spl, uE = splprep([E_vals[0], E_vals[1]], u=psi_parameterize(grid, E_vals[0], E_vals[1]), s=10)
-        except Exception as e:
-            print(' Number of points on the boundary:', len(self.E.p))
-            plt.plot(E_vals[0], E_vals[1], '.', color='black')
-            print(repr(e))
+        # The boundary splines only depend on the patch edges and the psi map,
+        # so they are reused when the same patch is refined again. The psi map
+        # itself is kept with the cache so a reloaded equilibrium never matches.
+        boundary_key = tuple((tuple(line.xval), tuple(line.yval), len(line.p)) for line in (self.N, self.E, self.S, self.W))
+        if self._boundary_splines is not None and self._boundary_splines[0] is grid.PsiNorm \
+                and self._boundary_splines[1] == boundary_key:
+            if verbose: print(' # Reuse the boundary B-Splines of the previous refinement.')
+            (N_vals, S_vals, W_vals, E_vals, uW, uE,
+             self.N_spl, self.S_spl, self.W_spl, self.E_spl) = self._boundary_splines[2]
+        else:
+            fitted = True
+            if verbose: print(' # Create B-Splines along the North and South boundaries.')
+            # Create B-Splines along the North and South boundaries.
+            N_vals = self.N.fluff()
+
+            self.N_spl, uN = interp_spline(N_vals)
+            # Reverse the orientation of the South line to line up with the North.
+
+            S_vals = self.S.reverse_copy().fluff()
+            self.S_spl, uS = interp_spline(S_vals)
+            if verbose: print(' # Create B-Splines along West boundaries.')
+            # Create B-Splines along the East and West boundaries.
+            # Parameterize EW splines in Psi
+            try:
+                #Cannot fluff with too many points
+                n = 500 if len(self.W.p) < 50 else 100
+               # W_vals = self.W.reverse_copy().fluff(num = n)
+                W_vals = self.W.reverse_copy().fluff(n, verbose=verbose)
+                Psi = psi_parameterize(grid, W_vals[0], W_vals[1])
+                self.W_spl, uW = splprep([W_vals[0], W_vals[1]], u=Psi, s=10)
+            except Exception as e:
+                fitted = False
+                exc_type, exc_obj, tb = sys.exc_info()
+                f = tb.tb_frame
+                lineno = tb.tb_lineno
+                filename = f.f_code.co_filename
+                linecache.checkcache(filename)
+                line = linecache.getline(filename, lineno, f.f_globals)
+                print('EXCEPTION IN ({}, LINE {} "{}"): {}'.format(filename, lineno, line.strip(), exc_obj))
+
+            if verbose: print(' # Create B-Splines along the East boundaries.')
+            try:
+                n = 500 if len(self.E.p) < 50 else 100
+                E_vals = self.E.fluff(num=n)
+                self.E_spl, uE = splprep([E_vals[0], E_vals[1]], u=psi_parameterize(grid, E_vals[0], E_vals[1]), s=10)
+            except Exception as e:
+                fitted = False
+                print(' Number of points on the boundary:', len(self.E.p))
+                plt.plot(E_vals[0], E_vals[1], '.', color='black')
+                print(repr(e))
+            if fitted:
+                self._boundary_splines = (grid.PsiNorm, boundary_key, (N_vals, S_vals, W_vals, E_vals, uW, uE,
+                                                                        self.N_spl, self.S_spl, self.W_spl, self.E_spl))
         if verbose: print(' #check plate_patch')
 
         if self.plate_patch:
@@ -876,7 +941,7 @@ class Patch:
                 plate_north_index, plate_south_index = plate_south_index, plate_north_index
 
             U_vals = [U_vals[0][plate_south_index:plate_north_index + 1], U_vals[1][plate_south_index:plate_north_index + 1]]
-            U_spl, _u = splprep([U_vals[0], U_vals[1]], u=psi_parameterize(grid, U_vals[0], U_vals[1]), s=0)
+            U_spl, _u = interp_spline(U_vals, u=psi_parameterize(grid, U_vals[0], U_vals[1]))
 
             if self.plate_location == 'W':
                 W_vals = U_vals
@@ -897,37 +962,28 @@ class Patch:
         if verbose: print('# Generate our sub-grid anchor points along the North and South boundaries of our patch.')
         # and South boundaries of our patch')
 
+        u_pol = transform(_poloidal_f, np_lines)
+
         if self.BoundaryPoints.get('N') is None:
-            for i in range(np_lines):
-                _n = splev(_poloidal_f(i / (np_lines - 1)), self.N_spl)
-                self.N_vertices.append(Point((float(_n[0]), float(_n[1]))))
+            self.N_vertices = spline_points(u_pol, self.N_spl)
         else:
             if verbose: print('Find boundary points at face "N" for {}:{}'.format(self.patch_name, self.BoundaryPoints.get('N')))
             self.N_vertices = self.BoundaryPoints.get('N')
 
         if self.BoundaryPoints.get('S') is None:
-            for i in range(np_lines):
-                _s = splev(_poloidal_f(i / (np_lines - 1)), self.S_spl)
-                self.S_vertices.append(Point((float(_s[0]), float(_s[1]))))
+            self.S_vertices = spline_points(u_pol, self.S_spl)
         else:
             self.S_vertices = self.BoundaryPoints.get('S')
 
-        u = [_radial_f(i / (nr_lines - 1)) for i in range(nr_lines)]
-
-        Npts = 1000
-        xy = splev(np.linspace(0, 1, Npts), self.E_spl)
+        u_rad = transform(_radial_f, nr_lines)
 
         if self.BoundaryPoints.get('W') is None:
-            for i in range(nr_lines):
-                _w = splev(u[i], self.W_spl)
-                self.W_vertices.append(Point((float(_w[0]), float(_w[1]))))
+            self.W_vertices = spline_points(u_rad, self.W_spl)
         else:
             self.W_vertices = self.BoundaryPoints.get('W')
 
         if self.BoundaryPoints.get('E') is None:
-            for i in range(nr_lines):
-                _e = splev(u[i], self.E_spl)
-                self.E_vertices.append(Point((float(_e[0]), float(_e[1]))))
+            self.E_vertices = spline_points(u_rad, self.E_spl)
         else:
             self.E_vertices = self.BoundaryPoints.get('E')
 
@@ -950,8 +1006,7 @@ class Patch:
                 ms = 6
                 markers = ['o', 'X', 's', 'D']
             for vertices, mark in zip([self.W_vertices, self.E_vertices, self.N_vertices, self.S_vertices], markers):
-                for p in vertices:
-                    plt.plot(p.x, p.y, '.', color=color, markersize=ms, marker=mark, markeredgecolor='black')
+                plt.plot([p.x for p in vertices], [p.y for p in vertices], '.', color=color, markersize=ms, marker=mark, markeredgecolor='black')
         # Radial lines of Psi surfaces. Ordered with increasing magnitude, starting with
         # the South boundary of the current Patch, and ending with the North boundary of
         # this current Patch. These will serve as delimiters when constructing cells.
@@ -969,29 +1024,28 @@ class Patch:
                 direction='cw', show_plot=visual, dynamic_step=dynamic_step, text=verbose))
             temp_vertices.append(radial_lines[-1].p[-1])
             radial_vals = radial_lines[i + 1].fluff(1000)
-            Radial_spl, uR = splprep([radial_vals[0], radial_vals[1]], s=0)
+            Radial_spl, uR = interp_spline(radial_vals)
             self.radial_spl.append(Radial_spl)
             vertex_list = []
+            radial_points = spline_points(u_pol, self.radial_spl[i])
             for j in range(np_lines):
-                u = _poloidal_f(j / (np_lines - 1))
-                _r = splev(u, self.radial_spl[i])
-                Pt = Point((float(_r[0]), float(_r[1])))
+                u = u_pol[j]
+                Pt = radial_points[j]
                 if self.distortion_correction['active'] and j > 0 and j < np_lines - 1:
                     Res = self.distortion_correction['resolution']
                     ThetaMin = self.distortion_correction['theta_min']
                     ThetaMax = self.distortion_correction['theta_max']
-                    umin = _poloidal_f((j - 1) / (np_lines - 1))
-                    umax = _poloidal_f((j + 1) / (np_lines - 1))
+                    umin = u_pol[j - 1]
+                    umax = u_pol[j + 1]
                     Pt1 = radial_vertices[i][j]
                     Pt2 = radial_vertices[i][j - 1]
                     Tag = '---- Correcting points: {},{}'.format(i, j)
                     Pt = CorrectDistortion(u, Pt, Pt1, Pt2, self.radial_spl[i], ThetaMin, ThetaMax, umin, umax, Res, visual, Tag, verbose)
 
                 vertex_list.append(Pt)
-                if visual:
-                    for p in vertex_list:
-                        plt.plot(p.x, p.y, '.', color='black', markersize=8)
 
+            if visual:
+                plt.plot([p.x for p in vertex_list], [p.y for p in vertex_list], '.', color='black', markersize=8)
             radial_vertices.append(vertex_list)
         radial_lines.append(self.S)
         temp_vertices.append(self.S.p[0])
@@ -1000,13 +1054,13 @@ class Patch:
         #Correct point on south boundary
         if self.distortion_correction['active']:
             for j in range(1, np_lines - 1):
-                u = _poloidal_f(j / (np_lines - 1))
+                u = u_pol[j]
                 Pt = self.S_vertices[j]
                 Res = self.distortion_correction['resolution']
                 ThetaMin = self.distortion_correction['theta_min']
                 ThetaMax = self.distortion_correction['theta_max']
-                umin = _poloidal_f((j - 1) / (np_lines - 1))
-                umax = _poloidal_f((j + 1) / (np_lines - 1))
+                umin = u_pol[j - 1]
+                umax = u_pol[j + 1]
                 Pt1 = radial_vertices[-1][j]
                 Pt2 = radial_vertices[-1][j - 1]
                 Tag = '---- Correcting south boundary points:{}'.format(j)
@@ -1036,15 +1090,11 @@ class Patch:
             list of values to parameterize a spline
             in Psi. Returns a list to be used for splprep only
             """
-            vmax = grid.PsiNorm.get_psi(r[-1], z[-1])
-            vmin = grid.PsiNorm.get_psi(r[0], z[0])
-
-            vparameterization = np.empty(0)
-            for i in range(len(r)):
-                vcurr = grid.PsiNorm.get_psi(r[i], z[i])
-                vparameterization = np.append(vparameterization, abs((vcurr - vmin) / (vmax - vmin)))
+            vcurr = grid.PsiNorm.get_psi_vec(np.asarray(r), np.asarray(z))
+            vmin = vcurr[0]
+            vmax = vcurr[-1]
 
-            return vparameterization
+            return abs((vcurr - vmin) / (vmax - vmin))
 
         def IsMonotonic(psi, x, y, Str):
             if not (non_increasing(psi) or non_decreasing(psi)):
@@ -1197,24 +1247,28 @@ def find_split_index(split_point: Point, line: Line) -> tuple:
     The second entry of the tuple return value would be a value of True if
     the `split_point` parameter was used to define the `line` parameter.
     """
-    same_line_split = False
-    for i in range(len(line.p) - 1):
-        # Split point is exactly on a Line object's point. Occurs often
-        # when splitting a Line object with itself.
-
-        if split_point.y == line.p[i].y and split_point.x == line.p[i].x:
-            same_line_split = True
-            return i, same_line_split
-        # Create two vectors.
-        end_u = np.array([line.p[i + 1].x - line.p[i].x, line.p[i + 1].y - line.p[i].y])
-        split_v = np.array([split_point.x - line.p[i].x, split_point.y - line.p[i].y])
-
-        if is_between(end_u, split_v):
-            # store index corresponding to the start of the segment containing the split_point.
-            return i, same_line_split
-        else:
-            continue
-    return None, same_line_split
+    x = np.array([p.x for p in line.p])
+    y = np.array([p.y for p in line.p])
+
+    # Split point is exactly on a Line object's point. Occurs often
+    # when splitting a Line object with itself.
+    same = (y[:-1] == split_point.y) & (x[:-1] == split_point.x)
+
+    # Vectors along each segment (u) and from its start to the split point (v).
+    ux, uy = x[1:] - x[:-1], y[1:] - y[:-1]
+    vx, vy = split_point.x - x[:-1], split_point.y - y[:-1]
+
+    # Same test as is_between, applied to all segments at once.
+    between = (np.abs(ux * vy - uy * vx) < 1e-9) \
+        & (ux * vx + uy * vy > 0) \
+        & (np.sqrt(ux * ux + uy * uy) > np.sqrt(vx * vx + vy * vy))
+
+    # Index corresponding to the start of the first segment containing the split_point.
+    candidates = np.flatnonzero(same | between)
+    if len(candidates) == 0:
+        return None, False
+    i = int(candidates[0])
+    return i, bool(same[i])
 
 
 def is_between(end_u: 'array-like', split_v: 'array-like') -> bool:
@@ -1355,27 +1409,14 @@ def calc_mid_point(v1, v2):
 
     """
     # bisection
-    theta = np.arccos(np.dot(v1.arr(), v2.arr()) / (v1.mag() * v2.mag())) / 2.
-
-    # check with quadrant the vectors are in and
-    # compute the angles appropriately
-    if v1.quadrant == (1, 1):
-        # NE quadrant
-        angle = np.arccos(v1.xnorm / v1.mag())
-    elif v1.quadrant == (-1, 1):
-        # NW quadrant
-        angle = np.pi - np.arcsin(v1.ynorm / v1.mag())
-    elif v1.quadrant == (-1, -1):
-        # SW quadrant
-        angle = np.pi + np.arctan(v1.ynorm / v1.xnorm)
-    elif v1.quadrant == (1, -1):
-        # SE quadrant
-        angle = - np.arccos(v1.xnorm / v1.mag())
-    else:
-        print("Something went wrong")
+    mag = v1.mag()
+    theta = np.arccos(np.dot(v1.arr(), v2.arr()) / (mag * v2.mag())) / 2.
+
+    # angle of v1 measured from the positive x-axis, valid in all quadrants
+    angle = np.arctan2(v1.ynorm, v1.xnorm)
 
-    x = v1.xorigin + v1.mag() * np.cos(theta + angle)
-    y = v1.yorigin + v1.mag() * np.sin(theta + angle)
+    x = v1.xorigin + mag * np.cos(theta + angle)
+    y = v1.yorigin + mag * np.sin(theta + angle)
     return x, y
 
 
@@ -1425,38 +1466,25 @@ def intersect(line1, line2, verbose=False):
     tuple
         Coordinates of the intersection.
 
+    Notes
+    -----
+    Both segments are extended to infinite lines. If line2 holds more than
+    two points, the first of its segments that is not parallel to line1 is
+    used. (nan, nan) is returned if every segment is parallel to line1.
     """
-    # TODO: Imporove this method so it can handle verticle lines.
-    # there is a division by zero error in some DIII-D data caused by this.
-    def line(x, line):
-        """ Point slope form. """
-        (x1, y1), (x2, y2) = line
-        if x2 - x1 == 0:
-            x1 += 1e-4
-
-        return (y2 - y1) / (x2 - x1) * (x - x1) + y1
-
-    def f(xy):
-        # parse the line, access any point
-        # normalized to help solve for zero
-        x, y = xy
-        return np.array([y - line(x, line1),
-                         y - line(x, test_line)])
-
+    (x1, y1), (x2, y2) = line1
     if isinstance(line2, Line):
         line2 = [(p.x, p.y) for p in line2.p]
     for ind in range(len(line2) - 1):
-        # use the mean for initial guess
-        test_line = [line2[ind], line2[ind + 1]]
-        (a, b), (c, d) = line1
-        (i, j), (p, q) = test_line
-        guess = (np.mean([a, c, i, p]), np.mean([b, d, j, q]))
-        sol, infoDict, ier, mesg = fsolve(f, guess, full_output=True)
-        if verbose:
-            print('{}: {}'.format(ind, mesg))
-        if ier == 1:
-            break
-    return sol[0], sol[1]
+        (x3, y3), (x4, y4) = line2[ind], line2[ind + 1]
+        denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+        if denom == 0:
+            if verbose:
+                print('{}: segment is parallel to line1'.format(ind))
+            continue
+        t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
+        return x1 + t * (x2 - x1), y1 + t * (y2 - y1)
+    return np.nan, np.nan
 
 
 def segment_intersect(line1, line2, verbose=False):
@@ -1475,20 +1503,23 @@ def segment_intersect(line1, line2, verbose=False):
     (xa, ya), (xb, yb) = line1
     if isinstance(line2, Line):
         line2 = [(p.x, p.y) for p in line2.p]
+    dxab, dyab = xb - xa, yb - ya
 
     for i in range(len(line2) - 1):
         (xc, yc), (xd, yd) = line2[i], line2[i + 1]
 
-        M = np.array([[xb - xa, -xd + xc], [yb - ya, -yd + yc]])
-        r = np.array([xc - xa, yc - ya])
-        try:
-            sol = np.linalg.solve(M, r)
-        except np.linalg.LinAlgError:
+        # Solve [[xb - xa, xc - xd], [yb - ya, yc - yd]] (s, t) = (xc - xa, yc - ya)
+        # by Cramer's rule; s runs along line1 and t along the current segment.
+        dxdc, dydc = xc - xd, yc - yd
+        det = dxab * dydc - dxdc * dyab
+        if det == 0:
             continue
+        rx, ry = xc - xa, yc - ya
+        s = (rx * dydc - dxdc * ry) / det
+        t = (dxab * ry - dyab * rx) / det
 
-        if (sol[0] <= 1) and (sol[1] <= 1) \
-                and (sol[0] >= 0) and (sol[1] >= 0):
-            return True, [(xc, yc), (xc + sol[1] * (xd - xc), yc + sol[1] * (yd - yc))]
+        if 0 <= s <= 1 and 0 <= t <= 1:
+            return True, [(xc, yc), (xc + t * (xd - xc), yc + t * (yd - yc))]
     return False, [(np.nan, np.nan), (np.nan, np.nan)]
 
 
@@ -6,7 +6,6 @@ related computations.
 """
 from __future__ import division, print_function, absolute_import
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.ndimage import zoom
 from scipy.interpolate import RectBivariateSpline as rbs
 
@@ -42,6 +41,11 @@ class EfitData:
         Specify the title of the figure the data will be plotted on.
     """
 
+    # Derivative orders (dr, dz) for each get_psi tag.
+    PSI_TAGS = {'v': (0, 0), 'vr': (1, 0), 'vrr': (2, 0),
+                'vz': (0, 1), 'vzz': (0, 2), 'vrz': (1, 1)
+    }
+
     def __init__(self, rmin=0.0, rmax=1.0, nr=10, zmin=0.0, zmax=2.0, nz=20,
                  rcenter=1.6955000, bcenter=-2.1094041, rlimiter=None, zlimiter=None,
                  rmagx=0.0, zmagx=0.0, name='unnamed', parent=None):
@@ -70,6 +74,9 @@ class EfitData:
         self.name = name
         self.parent = parent
         self.psi_levels = {}
+        self._psi_level_keys = {}
+        self._refined_grids = {}
+        self.rbs_derivatives = {}
 
     def init_bivariate_spline(self, r: 'np.ndarray', 
                                     z: 'np.ndarray', 
@@ -91,6 +98,17 @@ class EfitData:
         """
         self.v = v  # Crude EFIT grid.
         self.rbs = rbs(r, z, v)  # RectBivariateSpline object.
+        self._refined_grids = {}  # Zoomed grids depend on v.
+        self._psi_level_keys = {}  # So do the drawn psi levels.
+
+        # Derivative splines for each get_psi tag. Evaluating a derivative
+        # through self.rbs rebuilds the derivative coefficients on every
+        # call, so build them once here when SciPy allows it (>= 1.9).
+        self.rbs_derivatives = {'v': self.rbs}
+        if hasattr(self.rbs, 'partial_derivative'):
+            for tag, (dx, dy) in self.PSI_TAGS.items():
+                if tag != 'v':
+                    self.rbs_derivatives[tag] = self.rbs.partial_derivative(dx, dy)
 
     def Gradient(self, xy: tuple) -> 'np.ndarray':
         """ Combines the first partial derivatives to solve the system for
@@ -108,10 +126,7 @@ class EfitData:
         """
         # combine the deriv functions to solve the system
         x, y = xy
-        F = np.zeros(2)
-        F[0] = self.get_psi(x, y, tag='vr')
-        F[1] = self.get_psi(x, y, tag='vz')
-        return F
+        return np.array(self.get_psi_grad(x, y))
 
     def Hessian(self, xy: tuple) -> 'np.ndarray':
         """ Compute the Hessian at a point.
@@ -130,10 +145,53 @@ class EfitData:
         H = np.zeros((2, 2))
         H[0, 0] = self.get_psi(x, y, 'vrr')
         H[1, 1] = self.get_psi(x, y, 'vzz')
-        H[0, 1] = self.get_psi(x, y, 'vrz')
-        H[1, 0] = self.get_psi(x, y, 'vrz')
+        H[0, 1] = H[1, 0] = self.get_psi(x, y, 'vrz')
         return H
 
+    def FindCriticalPoint(self, xy: tuple, tol: float = 1e-10, maxiter: int = 20) -> tuple:
+        """ Refine a critical point of psi (magnetic axis or x-point).
+
+        Runs a 2D Newton-Raphson iteration on the gradient of psi. The
+        Jacobian of the gradient is the Hessian, which the bicubic spline
+        provides analytically, so each step is a closed-form 2x2 solve.
+        Should Newton fail to converge (singular Hessian, poor guess, or
+        an iterate leaving the EFIT domain), the refinement falls back to
+        scipy.optimize.root.
+
+        Parameters
+        ----------
+        xy : array-like
+            Initial guess. Ex: xy = (x0, y0).
+        tol : float, optional
+            Convergence tolerance on the size of a Newton step.
+        maxiter : int, optional
+            Maximum number of Newton iterations.
+
+        Returns
+        -------
+        tuple
+            Coordinates (r, z) of the critical point.
+        """
+        r, z = float(xy[0]), float(xy[1])
+        for i in range(maxiter):
+            F = self.Gradient((r, z))
+            H = self.Hessian((r, z))
+            det = H[0, 0] * H[1, 1] - H[0, 1] * H[1, 0]
+            if det == 0.0:
+                break
+            dr = (H[1, 1] * F[0] - H[0, 1] * F[1]) / det
+            dz = (H[0, 0] * F[1] - H[1, 0] * F[0]) / det
+            r -= dr
+            z -= dz
+            if not (self.rmin <= r <= self.rmax and self.zmin <= z <= self.zmax):
+                break
+            if abs(dr) < tol and abs(dz) < tol:
+                return (r, z)
+
+        from scipy.optimize import root
+        sol = root(self.Gradient, xy, jac=self.Hessian)
+        return (sol.x[0], sol.x[1])
+
     def PsiFunction(self, xy):
         x, y = xy
         return self.get_psi(x, y)
@@ -160,12 +218,84 @@ class EfitData:
             Value of psi or its derviative at the coordinate specified.
         """
 
-        lookup = {'v': (0, 0), 'vr': (1, 0), 'vrr': (2, 0),
-                  'vz': (0, 1), 'vzz': (0, 2), 'vrz': (1, 1)
-        }
+        spline = self.rbs_derivatives.get(tag)
+        if spline is None:
+            dx, dy = self.PSI_TAGS[tag]
+            return self.rbs(r0, z0, dx, dy)[0]
+        return spline(r0, z0)[0]
+
+    def get_psi_grad(self, r0: float, z0: float) -> tuple:
+        """ Evaluate both first partial derivatives of psi at a point.
+
+        This is a convenience wrapper making two separate spline
+        evaluations, one per derivative; it is not a fused or cheaper
+        evaluation than calling get_psi_vec twice.
+
+        Parameters
+        ----------
+        r0 : float
+            R coordinate of the point of interest
+        z0 : float
+            Z coordinate of same point.
+
+        Returns
+        -------
+        tuple
+            Values (vr, vz) of the partial derivatives at (r0, z0).
+        """
+        return (self.get_psi_vec(r0, z0, tag='vr'), self.get_psi_vec(r0, z0, tag='vz'))
+
+    def get_psi_vec(self, r: 'np.ndarray', z: 'np.ndarray', tag: str = 'v') -> 'np.ndarray':
+        """ Vectorized counterpart of get_psi.
 
-        dx, dy = lookup[tag]
-        return self.rbs(r0, z0, dx, dy)[0]
+        Evaluates psi or one of its derivatives at many points with a
+        single spline call instead of one call per point.
+
+        Parameters
+        ----------
+        r : array-like
+            R coordinates of the points of interest
+        z : array-like
+            Z coordinates of the points. Must have the same shape as r.
+        tag : str, optional
+            tag is the type of derivative we want: v, vr, vz, vrz
+            if nothing is provided, it assumes no derivative (v).
+
+        Returns
+        -------
+        array
+            Values of psi or its derivative with the shape of r.
+        """
+        spline = self.rbs_derivatives.get(tag)
+        if spline is None:
+            dx, dy = self.PSI_TAGS[tag]
+            return self.rbs.ev(r, z, dx=dx, dy=dy)
+        return spline(r, z, grid=False)
+
+    def get_refined_grid(self, refine_factor: int = 10) -> tuple:
+        """
+        Get the EFIT data refined with SciPy zoom for plotting.
+
+        Zooming the full grid is expensive, so the result is cached per
+        refine_factor until the spline is re-initialized.
+
+        Parameters
+        ----------
+        refine_factor: int, optional
+            Refinement factor for to be passed to SciPy zoom method
+
+        Returns
+        -------
+        tuple
+            Refined arrays (rgrid, zgrid, data).
+        """
+        if refine_factor not in self._refined_grids:
+            data = zoom(input=self.v, zoom=refine_factor)
+            rgrid, zgrid = np.meshgrid(np.linspace(self.rmin, self.rmax, data.shape[0]),
+                                       np.linspace(self.zmin, self.zmax, data.shape[1]),
+                                       indexing='ij')
+            self._refined_grids[refine_factor] = (rgrid, zgrid, data)
+        return self._refined_grids[refine_factor]
 
     def plot_levels(self, level=1.0, color='red'):
         """
@@ -211,23 +341,30 @@ class EfitData:
         refine_factor: int, optional
             Refinement factor for to be passed to SciPy zoom method
         """
+        import matplotlib.pyplot as plt
+
+        # Skip re-contouring when this label already shows the same level
+        # on the axes it would be drawn on.
+        ax = plt.gca()
+        key = (round(float(level), 9), color, linestyles, refined, refine_factor)
+        if label in self.psi_levels and self._psi_level_keys.get(label) == key:
+            if self.psi_levels[label].collections[0].axes is ax:
+                return
 
         data = self.v
         rgrid = self.r
         zgrid = self.z
 
         if refined is True:
-            data = zoom(input=self.v, zoom=refine_factor)
-            rgrid, zgrid = np.meshgrid(np.linspace(self.rmin, self.rmax, data.shape[0]),
-                                       np.linspace(self.zmin, self.zmax, data.shape[1]),
-                                       indexing='ij')
+            rgrid, zgrid, data = self.get_refined_grid(refine_factor)
+        self._psi_level_keys.pop(label, None)
         try:
             self.psi_levels[label].collections[0].remove()
-            self.psi_levels[label] = plt.contour(rgrid, zgrid, data, [float(level)], colors=color, label=label, linestyles=linestyles)
-            self.psi_levels[label].collections[0].set_label(label)
         except:
-            self.psi_levels[label] = plt.contour(rgrid, zgrid, data, [float(level)], colors=color, label=label, linestyles=linestyles)
-            self.psi_levels[label].collections[0].set_label(label)
+            pass
+        self.psi_levels[label] = ax.contour(rgrid, zgrid, data, [float(level)], colors=color, label=label, linestyles=linestyles)
+        self.psi_levels[label].collections[0].set_label(label)
+        self._psi_level_keys[label] = key
 
     def plot_data(self: object, nlevs: int = 30, interactive: bool = True, fig: object = None,
                   ax: object = None, view_mode: str = 'filled', refined: bool = True, refine_factor: int = 10):
@@ -255,6 +392,7 @@ class EfitData:
         refine_factor: int, optional
             Refinement factor for to be passed to SciPy zoom method
         """
+        import matplotlib.pyplot as plt
 
         lev = self.v.min() + (self.v.max() - self.v.min()) * np.arange(nlevs) / (nlevs - 1)
         self.fig = fig if fig is not None else plt.figure('INGRID: ' + self.name, figsize=(8, 10))
@@ -266,10 +404,7 @@ class EfitData:
         zgrid = self.z
 
         if refined is True:
-            data = zoom(input=self.v, zoom=refine_factor)
-            rgrid, zgrid = np.meshgrid(np.linspace(self.rmin, self.rmax, data.shape[0]),
-                                       np.linspace(self.zmin, self.zmax, data.shape[1]),
-                                       indexing='ij')
+            rgrid, zgrid, data = self.get_refined_grid(refine_factor)
         if view_mode == 'lines':
             self.ax.contour(rgrid, zgrid, data, lev, cmap='gist_gray')
         elif view_mode == 'filled':
@@ -279,11 +414,14 @@ class EfitData:
         self.ax.set_ylabel('Z')
         self.ax.set_xlim(self.rmin, self.rmax)
         self.ax.set_ylim(self.zmin, self.zmax)
+        # Lines traced on top of the data must not trigger a relimit.
+        self.ax.set_autoscale_on(False)
         if interactive:
             plt.ion()
         self.fig.show()
 
     def clear_plot(self):
+        import matplotlib.pyplot as plt
         if plt.get_fignums():
             plt.clf()
         else:
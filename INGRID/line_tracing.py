@@ -111,6 +111,9 @@ class LineTracing:
         self.max_step = settings['integrator_settings']['max_step']
         print('max_step set to {}'.format(self.max_step))
 
+        # traced lines keyed by start point, target and integrator setup
+        self.line_cache = {}
+
         # initialize the function
         self._set_function(option, direction)
 
@@ -121,15 +124,16 @@ class LineTracing:
         """
 
         R, Z = xy
-        B_R = (1 / R) * self.grid.get_psi(R, Z, tag='vz')
-        B_Z = -(1 / R) * self.grid.get_psi(R, Z, tag='vr')
+        vr, vz = self.grid.get_psi_grad(R, Z)
+        B_R = (1 / R) * vz
+        B_Z = -(1 / R) * vr
         B = np.sqrt(B_R**2 + B_Z**2)
         dR = B_R / B
         dZ = B_Z / B
         if self.dir == 'cw':
-            return np.array([dR, dZ])
+            return [dR, dZ]
         else:
-            return -np.array([dR, dZ])
+            return [-dR, -dZ]
 
     def _differential_rho(self, t, xy):
         """
@@ -137,15 +141,16 @@ class LineTracing:
         to trace the radial lines.
         """
         R, Z = xy
-        B_R = (1 / R) * self.grid.get_psi(R, Z, tag='vz')
-        B_Z = -(1 / R) * self.grid.get_psi(R, Z, tag='vr')
+        vr, vz = self.grid.get_psi_grad(R, Z)
+        B_R = (1 / R) * vz
+        B_Z = -(1 / R) * vr
         B = np.sqrt(B_R**2 + B_Z**2)
         dR = B_Z / B
         dZ = -B_R / B
         if self.dir == 'cw':
-            return np.array([dR, dZ])
+            return [dR, dZ]
         else:
-            return -np.array([dR, dZ])
+            return [-dR, -dZ]
 
     def _differential_r_const(self, t, xy):
         """
@@ -159,9 +164,9 @@ class LineTracing:
         dR = B_R / B
         dZ = B_Z / B
         if self.dir == 'cw':
-            return np.array([dR, dZ])
+            return [dR, dZ]
         else:
-            return -np.array([dR, dZ])
+            return [-dR, -dZ]
 
     def _differential_z_const(self, t, xy):
         """
@@ -175,9 +180,9 @@ class LineTracing:
         dR = B_R / B
         dZ = B_Z / B
         if self.dir == 'cw':
-            return np.array([dR, dZ])
+            return [dR, dZ]
         else:
-            return -np.array([dR, dZ])
+            return [-dR, -dZ]
 
     def _set_function(self, option, direction):
         self.option = option
@@ -205,7 +210,7 @@ class LineTracing:
             return
 
         x0, y0 = event.xdata, event.ydata
-        plt.draw()
+        self.grid.ax.figure.canvas.draw_idle()
 
         if self.option in ['theta', 'rho']:
             self.draw_line((x0, y0), show_plot=True, text=True)
@@ -222,11 +227,7 @@ class LineTracing:
         """
 
         rxpt, zxpt = xpt
-        hessian = np.zeros((2, 2))
-        hessian[0, 0] = self.grid.get_psi(rxpt, zxpt, tag='vrr')
-        hessian[1, 1] = self.grid.get_psi(rxpt, zxpt, tag='vzz')
-        hessian[0, 1] = self.grid.get_psi(rxpt, zxpt, tag='vrz')
-        hessian[1, 0] = self.grid.get_psi(rxpt, zxpt, tag='vrz')
+        hessian = self.grid.Hessian((rxpt, zxpt))
 
         eigval, eigvect = np.linalg.eig(hessian)
         index = 0 if np.sign(eigval[0]) == -1 else 1
@@ -622,6 +623,38 @@ class LineTracing:
         else:
             if Verbose: print('rz_end type not recognized')
 
+        # Use minimum of self.dt or dynamic_step value if provided.
+        if dynamic_step:
+            dt = np.amin([self.dt, dynamic_step])
+            if dt < self.dt:
+                if Verbose: print('Using dynamic_step value!\n')
+        else:
+            dt = self.dt
+
+        # Patch construction traces several lines more than once (e.g. a
+        # shared stem towards the same target). The integration is
+        # deterministic, so identical requests reuse the first result.
+        # Line groups are excluded since they record the line hit.
+        cache_key = None
+        if test == 'point':
+            target = (xf, yf)
+        elif test == 'line':
+            target = tuple(tuple(p) for p in endLine)
+        elif test in ['psi', 'psi_horizontal', 'psi_vertical']:
+            target = psi_test
+        if test != 'line_group':
+            tilt = getattr(self, 'tilt_angle', None) if self.option == 'z_const' else None
+            cache_key = (tuple(ynot), test, target, self.option, self.dir, tilt, dt)
+            try:
+                cached = self.line_cache.get(cache_key)
+            except TypeError:
+                cache_key, cached = None, None
+            if cached is not None:
+                if show_plot:
+                    cached.plot(color=color, ax=self.grid.ax)
+                    self.grid.ax.figure.canvas.draw_idle()
+                return cached.copy()
+
         count = 0
         # unpack boundaries
         rmin = self.grid.rmin
@@ -629,9 +662,26 @@ class LineTracing:
         zmin = self.grid.zmin
         zmax = self.grid.zmax
 
+        # domain edges checked for intersections by converged()
+        boundary = [((rmin, zmin), (rmin, zmax)),
+                    ((rmin, zmax), (rmax, zmax)),
+                    ((rmax, zmax), (rmax, zmin)),
+                    ((rmax, zmin), (rmin, zmin))]
+
         self.time_in_converged = 0
         line = [Point(ynot)]
 
+        # Each segment starts where the previous one ended, so psi at the
+        # shared endpoint is remembered instead of being re-evaluated.
+        psi_memo = {}
+
+        def get_psi_memo(x, y):
+            key = (x, y)
+            if key not in psi_memo:
+                psi_memo.clear()
+                psi_memo[key] = self.grid.get_psi(x, y)
+            return psi_memo[key]
+
         def converged(points):
             # checks for converence of the line in various ways
 
@@ -652,21 +702,24 @@ class LineTracing:
                 if show_plot:
                     if hasattr(self.grid, 'ax') is False:
                         self.grid.plot_data()
-                    self.grid.ax.plot(x, y, '.-', linewidth=2, color=color, markersize=1.5)
-                    plt.draw()
-                    plt.pause(np.finfo(float).eps)
+                    ax = self.grid.ax
+                    canvas = ax.figure.canvas
+                    segment, = ax.plot(x, y, '.-', linewidth=2, color=color, markersize=1.5)
+                    if getattr(canvas, 'supports_blit', False):
+                        # Blit the new segment over the current canvas
+                        # rather than re-rendering the whole figure.
+                        ax.draw_artist(segment)
+                        canvas.blit(ax.bbox)
+                        canvas.flush_events()
+                    else:
+                        # plt.pause redraws the stale figure itself.
+                        plt.pause(np.finfo(float).eps)
 
             t1 = time()
             # don't go off the plot
-            boundary = [((rmin, zmin), (rmin, zmax)),
-                        ((rmin, zmax), (rmax, zmax)),
-                        ((rmax, zmax), (rmax, zmin)),
-                        ((rmax, zmin), (rmin, zmin))]
-
-            # check for intersections
+            p1 = (points[0][0], points[1][0])
+            p2 = (points[0][-1], points[1][-1])
             for edge in boundary:
-                p1 = (points[0][0], points[1][0])
-                p2 = (points[0][-1], points[1][-1])
                 # result = test2points(p1, p2, edge)
                 intersected, segment = segment_intersect((p1, p2), edge, text)
                 if intersected is True:
@@ -722,8 +775,8 @@ class LineTracing:
                 x1, y1 = points[0][0], points[1][0]
                 x2, y2 = points[0][-1], points[1][-1]
 
-                psi1 = self.grid.get_psi(x1, y1)
-                psi2 = self.grid.get_psi(x2, y2)
+                psi1 = get_psi_memo(x1, y1)
+                psi2 = get_psi_memo(x2, y2)
 
                 if (psi1 - psi_test) * (psi2 - psi_test) < 0:
                     success('psi test')
@@ -749,8 +802,8 @@ class LineTracing:
                 x1, y1 = points[0][0], points[1][0]
                 x2, y2 = points[0][-1], points[1][-1]
 
-                psi1 = self.grid.get_psi(x1, y1)
-                psi2 = self.grid.get_psi(x2, y2)
+                psi1 = get_psi_memo(x1, y1)
+                psi2 = get_psi_memo(x2, y2)
 
                 if (psi1 - psi_test) * (psi2 - psi_test) < 0:
                     success('horizontal psi integration')
@@ -766,8 +819,8 @@ class LineTracing:
                 x1, y1 = points[0][0], points[1][0]
                 x2, y2 = points[0][-1], points[1][-1]
 
-                psi1 = self.grid.get_psi(x1, y1)
-                psi2 = self.grid.get_psi(x2, y2)
+                psi1 = get_psi_memo(x1, y1)
+                psi2 = get_psi_memo(x2, y2)
 
                 if (psi1 - psi_test) * (psi2 - psi_test) < 0:
                     success('vertical psi integration')
@@ -798,14 +851,6 @@ class LineTracing:
         # size for each line segment
         told, tnew = 0, self.dt
 
-        # Use minimum of self.dt or dynamic_step value if provided.
-        if dynamic_step:
-            dt = np.amin([self.dt, dynamic_step])
-            if dt < self.dt:
-                if Verbose: print('Using dynamic_step value!\n')
-        else:
-            dt = self.dt
-
         if Verbose: print('# Tracing line', end='')
         while not converged(points):
             t_span = (told, tnew)
@@ -842,7 +887,13 @@ class LineTracing:
         if Verbose:
             print('Drew for {} seconds\n'.format(end - start))
         print('')
-        return Line(line)
+        if show_plot:
+            # Sync the full figure with the blitted segments.
+            self.grid.ax.figure.canvas.draw_idle()
+        traced = Line(line)
+        if cache_key is not None:
+            self.line_cache[cache_key] = traced.copy()
+        return traced
 
     def PsiCostFunc(self, xy):
         x, y = xy
@@ -6,13 +6,7 @@ Child of base :class:`utils.TopologyUtils`.
 
 """
 import numpy as np
-import matplotlib
 import pathlib
-try:
-    matplotlib.use("TkAgg")
-except:
-    pass
-import matplotlib.pyplot as plt
 from INGRID.utils import TopologyUtils
 from INGRID.geometry import Point, Line, Patch, trim_geometry
 from collections import OrderedDict
@@ -79,43 +73,45 @@ class SF105(TopologyUtils):
             'I3': {'W': ('H3', 'E')}
         }
 
+        # Corners of patches that touch an x-point, snapped onto it by AdjustPatch.
+        self.XptCornerMap = {
+            'B3': (('xpt1', 'SE'),),
+            'B2': (('xpt1', 'NE'), ('xpt2', 'SW')),
+            'C3': (('xpt1', 'SW'),),
+            'C2': (('xpt1', 'NW'),),
+            'F3': (('xpt1', 'SE'),),
+            'F2': (('xpt1', 'NE'),),
+            'G3': (('xpt1', 'SW'),),
+            'G2': (('xpt1', 'NW'),),
+            'A1': (('xpt2', 'NE'),),
+            'I1': (('xpt2', 'NW'),),
+            'I2': (('xpt2', 'SW'),),
+            'H2': (('xpt2', 'SE'),),
+            'H1': (('xpt2', 'NE'),),
+        }
+
     def construct_patches(self):
         """
         """
 
-        try:
-            visual = self.settings['DEBUG']['visual']['patch_map']
-        except KeyError:
-            visual = False
-        try:
-            verbose = self.settings['DEBUG']['verbose']['patch_generation']
-        except KeyError:
-            verbose = False
-        try:
-            magx_tilt_1 = self.settings['grid_settings']['patch_generation']['magx_tilt_1']
-        except KeyError:
-            magx_tilt_1 = 0.0
-        try:
-            magx_tilt_2 = self.settings['grid_settings']['patch_generation']['magx_tilt_2']
-        except KeyError:
-            magx_tilt_2 = 0.0
-        try:
-            core_split_point_ratio = self.settings['grid_settings']['patch_generation']['core_split_point_ratio']
-            core_split_point_ratio = min(0.95, core_split_point_ratio) if core_split_point_ratio > 0 else max(0.05, core_split_point_ratio)
-        except KeyError:
-            core_split_point_ratio = 0.5
-        try:
-            pf_split_point_ratio = self.settings['grid_settings']['patch_generation']['pf_split_point_ratio']
-            pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
-        except KeyError:
-            pf_split_point_ratio = 0.5
+        debug = self.settings.get('DEBUG', {})
+        patch_generation = self.settings.get('grid_settings', {}).get('patch_generation', {})
+
+        visual = debug.get('visual', {}).get('patch_map', False)
+        verbose = debug.get('verbose', {}).get('patch_generation', False)
+        magx_tilt_1 = patch_generation.get('magx_tilt_1', 0.0)
+        magx_tilt_2 = patch_generation.get('magx_tilt_2', 0.0)
+        core_split_point_ratio = patch_generation.get('core_split_point_ratio', 0.5)
+        core_split_point_ratio = min(0.95, core_split_point_ratio) if core_split_point_ratio > 0 else max(0.05, core_split_point_ratio)
+        pf_split_point_ratio = patch_generation.get('pf_split_point_ratio', 0.5)
+        pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
 
         xpt1 = self.LineTracer.NSEW_lookup['xpt1']['coor']
         xpt2 = self.LineTracer.NSEW_lookup['xpt2']['coor']
         xpt2_psi = self.PsiNorm.get_psi(xpt2['center'][0], xpt2['center'][1])
 
-        magx = np.array([self.settings['grid_settings']['rmagx'] + self.settings['grid_settings']['patch_generation']['rmagx_shift'],
-                         self.settings['grid_settings']['zmagx'] + self.settings['grid_settings']['patch_generation']['zmagx_shift']])
+        magx = np.array([self.settings['grid_settings']['rmagx'] + patch_generation['rmagx_shift'],
+                         self.settings['grid_settings']['zmagx'] + patch_generation['zmagx_shift']])
 
         psi_1 = self.settings['grid_settings']['psi_1']
         psi_2 = self.settings['grid_settings']['psi_2']
@@ -123,7 +119,7 @@ class SF105(TopologyUtils):
         psi_pf_1 = self.settings['grid_settings']['psi_pf_1']
         psi_pf_2 = self.settings['grid_settings']['psi_pf_2']
 
-        if self.settings['grid_settings']['patch_generation']['strike_pt_loc'] == 'limiter':
+        if patch_generation['strike_pt_loc'] == 'limiter':
             WestPlate1 = self.parent.LimiterData.copy()
             WestPlate2 = self.parent.LimiterData.copy()
 
@@ -138,18 +134,11 @@ class SF105(TopologyUtils):
             EastPlate2 = self.PlateData['plate_E2']
 
         # Generate Horizontal Mid-Plane lines
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_1), magx[1] - 1e6 * np.sin(magx_tilt_1))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_1), magx[1] + 1e6 * np.sin(magx_tilt_1))
-        midline_1 = Line([LHS_Point, RHS_Point])
-
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_2), magx[1] - 1e6 * np.sin(magx_tilt_2))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_2), magx[1] + 1e6 * np.sin(magx_tilt_2))
-        midline_2 = Line([LHS_Point, RHS_Point])
+        midline_1 = self._midline(magx, magx_tilt_1)
+        midline_2 = self._midline(magx, magx_tilt_2)
 
         # Generate Vertical Mid-Plane line
-        Lower_Point = Point(magx[0], magx[1] - 1e6)
-        Upper_Point = Point(magx[0], magx[1] + 1e6)
-        topLine = Line([Lower_Point, Upper_Point])
+        topLine = self._midline(magx, np.pi / 2)
         # topLine.plot()
 
         # Tracing primary-separatrix: core-boundary
@@ -213,16 +202,16 @@ class SF105(TopologyUtils):
         E1_S = self.LineTracer.draw_line(F1_S.p[-1], {'line': topLine}, option='theta', direction='ccw',
             show_plot=visual, text=verbose)
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_W']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_W_tilt']
+        if patch_generation['use_xpt1_W']:
+            tilt = patch_generation['xpt1_W_tilt']
             B3_E = self.LineTracer.draw_line(xpt1['W'], {'psi_horizontal': (psi_1, tilt)}, option='z_const', direction='ccw', show_plot=visual, text=verbose).reverse_copy()
         else:
             B3_E = self.LineTracer.draw_line(xpt1['W'], {'psi': psi_1}, option='rho', direction='ccw',
                 show_plot=visual, text=verbose).reverse_copy()
         C3_W = B3_E.reverse_copy()
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_E']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_E_tilt']
+        if patch_generation['use_xpt1_E']:
+            tilt = patch_generation['xpt1_E_tilt']
             F3_E = self.LineTracer.draw_line(xpt1['E'], {'psi_horizontal': (psi_1, tilt)}, option='z_const', direction='cw', show_plot=visual, text=verbose).reverse_copy()
         else:
             F3_E = self.LineTracer.draw_line(xpt1['E'], {'psi': psi_1}, option='rho', direction='ccw',
@@ -291,8 +280,8 @@ class SF105(TopologyUtils):
         B1_S__H1_S = self.LineTracer.draw_line(B1_E.p[-1], {'line': EastPlate2}, option='theta', direction='ccw',
             show_plot=visual, text=verbose)
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt2_E']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt2_E_tilt']
+        if patch_generation['use_xpt2_E']:
+            tilt = patch_generation['xpt2_E_tilt']
             H1_E = self.LineTracer.draw_line(xpt2['E'], {'line': (B1_S__H1_S, tilt)}, option='z_const', direction='cw', show_plot=visual, text=verbose)
         else:
             H1_E = self.LineTracer.draw_line(xpt2['E'], {'line': B1_S__H1_S}, option='rho', direction='cw',
@@ -313,8 +302,8 @@ class SF105(TopologyUtils):
         H3_E, H2_E = H3_E__H2_E.split(H3_E__H2_E.p[ind], add_split_point=True)
         I3_W, I2_W = H3_E.reverse_copy(), H2_E.reverse_copy()
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt2_W']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt2_W_tilt']
+        if patch_generation['use_xpt2_W']:
+            tilt = patch_generation['xpt2_W_tilt']
             A1_E = self.LineTracer.draw_line(xpt2['W'], {'psi_horizontal': (psi_2, tilt)}, option='z_const', direction='ccw', show_plot=visual, text=verbose)
         else:
             A1_E = self.LineTracer.draw_line(xpt2['W'], {'psi': psi_2}, option='rho', direction='cw',
@@ -459,12 +448,7 @@ class SF105(TopologyUtils):
         patches = [A3, A2, A1, B3, B2, B1, C3, C2, C1, D3, D2, D1, E3, E2, E1,
                    F3, F2, F1, G3, G2, G1, H3, H2, H1, I3, I2, I1]
 
-        self.patches = {}
-        for patch in patches:
-            patch.parent = self
-            patch.PatchTagMap = self.PatchTagMap
-            self.patches[patch.patch_name] = patch
-        self.OrderPatches()
+        self.SetPatches(patches)
 
     def OrderPatches(self):
 
@@ -510,39 +494,6 @@ class SF105(TopologyUtils):
             except:
                 pass
 
-    def AdjustPatch(self, patch):
-        xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
-        xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
-
-        tag = patch.get_tag()
-        if tag == 'B3':
-            patch.adjust_corner(xpt1, 'SE')
-        elif tag == 'B2':
-            patch.adjust_corner(xpt1, 'NE')
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'C3':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'C2':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'F3':
-            patch.adjust_corner(xpt1, 'SE')
-        elif tag == 'F2':
-            patch.adjust_corner(xpt1, 'NE')
-        elif tag == 'G3':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'G2':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'A1':
-            patch.adjust_corner(xpt2, 'NE')
-        elif tag == 'I1':
-            patch.adjust_corner(xpt2, 'NW')
-        elif tag == 'I2':
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'H2':
-            patch.adjust_corner(xpt2, 'SE')
-        elif tag == 'H1':
-            patch.adjust_corner(xpt2, 'NE')
-
     def GroupPatches(self):
         # p = self.patches
         # self.PatchGroup = {'SOL' : [],
@@ -599,36 +550,16 @@ class SF105(TopologyUtils):
             ix_plate4 += self.patches[alpha + '1'].npol - 1
         ix_plate4 += 2
 
-        psi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        br = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bz = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bpol = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bphi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        b = np.zeros((nxm + 2, nym + 2, 5), order='F')
-
-        rm = self.rm
-        zm = self.zm
+        rm = np.asarray(self.rm)
+        zm = np.asarray(self.zm)
         rb_prod = self.PsiUNorm.rcenter * self.PsiUNorm.bcenter
 
-        for i in range(len(b)):
-            for j in range(len(b[0])):
-                for k in range(5):
-                    _r = rm[i][j][k]
-                    _z = zm[i][j][k]
-
-                    _psi = self.PsiUNorm.get_psi(_r, _z)
-                    _br = self.PsiUNorm.get_psi(_r, _z, tag='vz') / _r
-                    _bz = -self.PsiUNorm.get_psi(_r, _z, tag='vr') / _r
-                    _bpol = np.sqrt(_br ** 2 + _bz ** 2)
-                    _bphi = rb_prod / _r
-                    _b = np.sqrt(_bpol ** 2 + _bphi ** 2)
-
-                    psi[i][j][k] = _psi
-                    br[i][j][k] = _br
-                    bz[i][j][k] = _bz
-                    bpol[i][j][k] = _bpol
-                    bphi[i][j][k] = _bphi
-                    b[i][j][k] = _b
+        psi = self.PsiUNorm.get_psi_vec(rm, zm)
+        br = self.PsiUNorm.get_psi_vec(rm, zm, tag='vz') / rm
+        bz = -self.PsiUNorm.get_psi_vec(rm, zm, tag='vr') / rm
+        bpol = np.sqrt(br ** 2 + bz ** 2)
+        bphi = rb_prod / rm
+        b = np.sqrt(bpol ** 2 + bphi ** 2)
 
         self.gridue_settings = {
             'nxm': nxm, 'nym': nym, 'iyseparatrix1': iyseparatrix1, 'iyseparatrix2': iyseparatrix2,
@@ -6,13 +6,7 @@ Child of base :class:`utils.TopologyUtils`.
 
 """
 import numpy as np
-import matplotlib
 import pathlib
-try:
-    matplotlib.use("TkAgg")
-except:
-    pass
-import matplotlib.pyplot as plt
 from INGRID.utils import TopologyUtils
 from INGRID.geometry import Point, Line, Patch, trim_geometry
 from collections import OrderedDict
@@ -80,6 +74,25 @@ class SF135(TopologyUtils):
             'I3': {'W': ('H3', 'E')}
         }
 
+        # Corners of patches that touch an x-point, snapped onto it by AdjustPatch.
+        self.XptCornerMap = {
+            'B2': (('xpt1', 'SE'), ('xpt2', 'NW')),
+            'B1': (('xpt1', 'NE'),),
+            'C2': (('xpt1', 'SW'),),
+            'C1': (('xpt1', 'NW'),),
+            'F2': (('xpt1', 'SE'),),
+            'F1': (('xpt1', 'NE'),),
+            'G2': (('xpt1', 'SW'),),
+            'G1': (('xpt1', 'NW'),),
+            'A3': (('xpt2', 'SE'),),
+            'B3': (('xpt2', 'SW'),),
+            'A2': (('xpt2', 'NE'),),
+            'I2': (('xpt2', 'NW'),),
+            'I3': (('xpt2', 'SW'),),
+            'H3': (('xpt2', 'SE'),),
+            'H2': (('xpt2', 'NE'),),
+        }
+
     def construct_patches(self):
         """
         Draws lines and creates patches for both USN and LSN configurations.
@@ -95,38 +108,23 @@ class SF135(TopologyUtils):
             C: Core.
         """
 
-        try:
-            visual = self.settings['DEBUG']['visual']['patch_map']
-        except KeyError:
-            visual = False
-        try:
-            verbose = self.settings['DEBUG']['verbose']['patch_generation']
-        except KeyError:
-            verbose = False
-        try:
-            magx_tilt_1 = self.settings['grid_settings']['patch_generation']['magx_tilt_1']
-        except KeyError:
-            magx_tilt_1 = 0.0
-        try:
-            magx_tilt_2 = self.settings['grid_settings']['patch_generation']['magx_tilt_2']
-        except KeyError:
-            magx_tilt_2 = 0.0
-        try:
-            core_split_point_ratio = self.settings['grid_settings']['patch_generation']['core_split_point_ratio']
-            core_split_point_ratio = min(0.95, core_split_point_ratio) if core_split_point_ratio > 0 else max(0.05, core_split_point_ratio)
-        except KeyError:
-            core_split_point_ratio = 0.5
-        try:
-            pf_split_point_ratio = self.settings['grid_settings']['patch_generation']['pf_split_point_ratio']
-            pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
-        except KeyError:
-            pf_split_point_ratio = 0.5
+        debug = self.settings.get('DEBUG', {})
+        patch_generation = self.settings.get('grid_settings', {}).get('patch_generation', {})
+
+        visual = debug.get('visual', {}).get('patch_map', False)
+        verbose = debug.get('verbose', {}).get('patch_generation', False)
+        magx_tilt_1 = patch_generation.get('magx_tilt_1', 0.0)
+        magx_tilt_2 = patch_generation.get('magx_tilt_2', 0.0)
+        core_split_point_ratio = patch_generation.get('core_split_point_ratio', 0.5)
+        core_split_point_ratio = min(0.95, core_split_point_ratio) if core_split_point_ratio > 0 else max(0.05, core_split_point_ratio)
+        pf_split_point_ratio = patch_generation.get('pf_split_point_ratio', 0.5)
+        pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
 
         xpt1 = self.LineTracer.NSEW_lookup['xpt1']['coor']
         xpt2 = self.LineTracer.NSEW_lookup['xpt2']['coor']
 
-        magx = np.array([self.settings['grid_settings']['rmagx'] + self.settings['grid_settings']['patch_generation']['rmagx_shift'],
-            self.settings['grid_settings']['zmagx'] + self.settings['grid_settings']['patch_generation']['zmagx_shift']])
+        magx = np.array([self.settings['grid_settings']['rmagx'] + patch_generation['rmagx_shift'],
+            self.settings['grid_settings']['zmagx'] + patch_generation['zmagx_shift']])
 
         psi_1 = self.settings['grid_settings']['psi_1']
         psi_2 = self.settings['grid_settings']['psi_2']
@@ -135,7 +133,7 @@ class SF135(TopologyUtils):
         psi_pf_2 = self.settings['grid_settings']['psi_pf_2']
         psi_separatrix_2 = Point(xpt2['center']).psi(self)
 
-        if self.settings['grid_settings']['patch_generation']['strike_pt_loc'] == 'limiter':
+        if patch_generation['strike_pt_loc'] == 'limiter':
             WestPlate1 = self.parent.LimiterData.copy()
             WestPlate2 = self.parent.LimiterData.copy()
 
@@ -150,18 +148,11 @@ class SF135(TopologyUtils):
             EastPlate2 = self.PlateData['plate_E2']
 
         # Generate Horizontal Mid-Plane lines
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_1), magx[1] - 1e6 * np.sin(magx_tilt_1))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_1), magx[1] + 1e6 * np.sin(magx_tilt_1))
-        midline_1 = Line([LHS_Point, RHS_Point])
-
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_2), magx[1] - 1e6 * np.sin(magx_tilt_2))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_2), magx[1] + 1e6 * np.sin(magx_tilt_2))
-        midline_2 = Line([LHS_Point, RHS_Point])
+        midline_1 = self._midline(magx, magx_tilt_1)
+        midline_2 = self._midline(magx, magx_tilt_2)
 
         # Generate Vertical Mid-Plane line
-        Lower_Point = Point(magx[0], magx[1] - 1e6)
-        Upper_Point = Point(magx[0], magx[1] + 1e6)
-        topLine = Line([Lower_Point, Upper_Point])
+        topLine = self._midline(magx, np.pi / 2)
 
         F1_E = self.LineTracer.draw_line(xpt1['N'], {'psi': psi_core}, option='rho', direction='cw',
             show_plot=visual, text=verbose)
@@ -194,7 +185,6 @@ class SF135(TopologyUtils):
 
         # Save some key-strokes...
         d = self.LineTracer.draw_line
-        pg = self.settings['grid_settings']['patch_generation']
 
         E1_S = d(F1_S.p[-1], {'line': topLine}, option='theta', direction='ccw', show_plot=visual, text=verbose)
 
@@ -227,8 +217,8 @@ class SF135(TopologyUtils):
         F2_N__G2_N = d(E2_N.p[-1], {'line': EastPlate1}, option='theta', direction='cw',
             show_plot=visual, text=verbose)
 
-        if pg['use_xpt1_E']:
-            tilt = pg['xpt1_E_tilt']
+        if patch_generation['use_xpt1_E']:
+            tilt = patch_generation['xpt1_E_tilt']
             G2_W = d(xpt1['E'], {'line': (F2_N__G2_N, tilt)}, option='z_const', direction='cw',
                 show_plot=visual, text=verbose)
         else:
@@ -240,8 +230,8 @@ class SF135(TopologyUtils):
 
         F3_S, G3_S = F2_N.reverse_copy(), G2_N.reverse_copy()
 
-        if pg['use_xpt1_W']:
-            tilt = pg['xpt1_W_tilt']
+        if patch_generation['use_xpt1_W']:
+            tilt = patch_generation['xpt1_W_tilt']
             C2_W = d(xpt1['W'], {'line': (B2_N__C2_N, tilt)}, option='z_const', direction='ccw',
                 show_plot=visual, text=verbose)
         else:
@@ -269,8 +259,8 @@ class SF135(TopologyUtils):
             show_plot=visual, text=verbose)
         H2_N = H3_S.reverse_copy()
 
-        if pg['use_xpt2_E']:
-            tilt = pg['xpt2_E_tilt']
+        if patch_generation['use_xpt2_E']:
+            tilt = patch_generation['xpt2_E_tilt']
             I3_W = d(xpt2['E'], {'psi_horizontal': (psi_2, tilt)}, option='z_const', direction='cw',
                 show_plot=visual, text=verbose)
         else:
@@ -315,8 +305,8 @@ class SF135(TopologyUtils):
             show_plot=visual, text=verbose)
         A2_N = A3_S.reverse_copy()
 
-        if pg['use_xpt2_W']:
-            tilt = pg['xpt2_W_tilt']
+        if patch_generation['use_xpt2_W']:
+            tilt = patch_generation['xpt2_W_tilt']
             B3_W = d(xpt2['W'], {'psi_horizontal': (psi_1, tilt)}, option='z_const', direction='ccw',
                 show_plot=visual, text=verbose)
         else:
@@ -330,8 +320,8 @@ class SF135(TopologyUtils):
         B3_N__C3_N = d(B3_W.p[-1], {'line': midline_1}, option='theta', direction='cw',
             show_plot=visual, text=verbose)
 
-        if pg['use_xpt1_W']:
-            tilt = pg['xpt1_W_tilt']
+        if patch_generation['use_xpt1_W']:
+            tilt = patch_generation['xpt1_W_tilt']
             C3_W = d(B2_N.p[-1], {'line': (B3_N__C3_N, tilt)}, option='z_const', direction='ccw',
                 show_plot=visual, text=verbose)
         else:
@@ -347,8 +337,8 @@ class SF135(TopologyUtils):
 
         F3_N__G3_N = d(E3_N.p[-1], {'line': EastPlate1}, option='theta', direction='cw')
 
-        if pg['use_xpt1_E']:
-            tilt = pg['xpt1_E_tilt']
+        if patch_generation['use_xpt1_E']:
+            tilt = patch_generation['xpt1_E_tilt']
             G3_W = d(G2_W.p[-1], {'line': (F3_N__G3_N, tilt)}, option='z_const', direction='cw',
                 show_plot=visual, text=verbose)
         else:
@@ -458,12 +448,7 @@ class SF135(TopologyUtils):
         patches = [A3, A2, A1, B3, B2, B1, C3, C2, C1, D3, D2, D1, E3, E2, E1,
                    F3, F2, F1, G3, G2, G1, H3, H2, H1, I3, I2, I1]
 
-        self.patches = {}
-        for patch in patches:
-            patch.parent = self
-            patch.PatchTagMap = self.PatchTagMap
-            self.patches[patch.patch_name] = patch
-        self.OrderPatches()
+        self.SetPatches(patches)
 
     def OrderPatches(self):
 
@@ -509,43 +494,6 @@ class SF135(TopologyUtils):
             except:
                 pass
 
-    def AdjustPatch(self, patch):
-        xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
-        xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
-
-        tag = patch.get_tag()
-        if tag == 'B2':
-            patch.adjust_corner(xpt1, 'SE')
-            patch.adjust_corner(xpt2, 'NW')
-        elif tag == 'B1':
-            patch.adjust_corner(xpt1, 'NE')
-        elif tag == 'C2':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'C1':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'F2':
-            patch.adjust_corner(xpt1, 'SE')
-        elif tag == 'F1':
-            patch.adjust_corner(xpt1, 'NE')
-        elif tag == 'G2':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'G1':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'A3':
-            patch.adjust_corner(xpt2, 'SE')
-        elif tag == 'B3':
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'A2':
-            patch.adjust_corner(xpt2, 'NE')
-        elif tag == 'I2':
-            patch.adjust_corner(xpt2, 'NW')
-        elif tag == 'I3':
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'H3':
-            patch.adjust_corner(xpt2, 'SE')
-        elif tag == 'H2':
-            patch.adjust_corner(xpt2, 'NE')
-
     def GroupPatches(self):
         # p = self.patches
         # self.PatchGroup = {'SOL' : [],
@@ -603,36 +551,16 @@ class SF135(TopologyUtils):
             ix_plate4 += self.patches[alpha + '1'].npol - 1
         ix_plate4 += 2
 
-        psi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        br = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bz = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bpol = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bphi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        b = np.zeros((nxm + 2, nym + 2, 5), order='F')
-
-        rm = self.rm
-        zm = self.zm
+        rm = np.asarray(self.rm)
+        zm = np.asarray(self.zm)
         rb_prod = self.PsiUNorm.rcenter * self.PsiUNorm.bcenter
 
-        for i in range(len(b)):
-            for j in range(len(b[0])):
-                for k in range(5):
-                    _r = rm[i][j][k]
-                    _z = zm[i][j][k]
-
-                    _psi = self.PsiUNorm.get_psi(_r, _z)
-                    _br = self.PsiUNorm.get_psi(_r, _z, tag='vz') / _r
-                    _bz = -self.PsiUNorm.get_psi(_r, _z, tag='vr') / _r
-                    _bpol = np.sqrt(_br ** 2 + _bz ** 2)
-                    _bphi = rb_prod / _r
-                    _b = np.sqrt(_bpol ** 2 + _bphi ** 2)
-
-                    psi[i][j][k] = _psi
-                    br[i][j][k] = _br
-                    bz[i][j][k] = _bz
-                    bpol[i][j][k] = _bpol
-                    bphi[i][j][k] = _bphi
-                    b[i][j][k] = _b
+        psi = self.PsiUNorm.get_psi_vec(rm, zm)
+        br = self.PsiUNorm.get_psi_vec(rm, zm, tag='vz') / rm
+        bz = -self.PsiUNorm.get_psi_vec(rm, zm, tag='vr') / rm
+        bpol = np.sqrt(br ** 2 + bz ** 2)
+        bphi = rb_prod / rm
+        b = np.sqrt(bpol ** 2 + bphi ** 2)
 
         self.gridue_settings = {
             'nxm': nxm, 'nym': nym, 'iyseparatrix1': iyseparatrix1, 'iyseparatrix2': iyseparatrix2,
@@ -6,13 +6,7 @@ Child of base :class:`utils.TopologyUtils`.
 
 """
 import numpy as np
-import matplotlib
 import pathlib
-try:
-    matplotlib.use("TkAgg")
-except:
-    pass
-import matplotlib.pyplot as plt
 from INGRID.utils import TopologyUtils
 from INGRID.geometry import Point, Line, Patch, trim_geometry
 from collections import OrderedDict
@@ -87,6 +81,25 @@ class SF15(TopologyUtils):
             'I3': {'W': ('H3', 'E')},
         }
 
+        # Corners of patches that touch an x-point, snapped onto it by AdjustPatch.
+        self.XptCornerMap = {
+            'A2': (('xpt1', 'SE'),),
+            'A1': (('xpt1', 'NE'),),
+            'B2': (('xpt1', 'SW'),),
+            'B1': (('xpt1', 'NW'),),
+            'H2': (('xpt1', 'SE'), ('xpt2', 'NW')),
+            'H1': (('xpt1', 'NE'),),
+            'I2': (('xpt1', 'SW'),),
+            'I1': (('xpt1', 'NW'),),
+            'H3': (('xpt2', 'SW'),),
+            'G3': (('xpt2', 'SE'),),
+            'G2': (('xpt2', 'NE'),),
+            'F2': (('xpt2', 'NW'),),
+            'F3': (('xpt2', 'SW'),),
+            'E3': (('xpt2', 'SE'),),
+            'E2': (('xpt2', 'NE'),),
+        }
+
     def AdjustGrid(self) -> None:
         """
         Adjust the grid so that no holes occur at x-points, and cell grid
@@ -125,33 +138,21 @@ class SF15(TopologyUtils):
         """
         """
 
-        try:
-            visual = self.settings['DEBUG']['visual']['patch_map']
-        except KeyError:
-            visual = False
-        try:
-            verbose = self.settings['DEBUG']['verbose']['patch_generation']
-        except KeyError:
-            verbose = False
-        try:
-            magx_tilt_1 = self.settings['grid_settings']['patch_generation']['magx_tilt_1']
-        except KeyError:
-            magx_tilt_1 = 0.0
-        try:
-            magx_tilt_2 = self.settings['grid_settings']['patch_generation']['magx_tilt_2']
-        except KeyError:
-            magx_tilt_2 = 0.0
-        try:
-            pf_split_point_ratio = self.settings['grid_settings']['patch_generation']['pf_split_point_ratio']
-            pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
-        except KeyError:
-            pf_split_point_ratio = 0.5
+        debug = self.settings.get('DEBUG', {})
+        patch_generation = self.settings.get('grid_settings', {}).get('patch_generation', {})
+
+        visual = debug.get('visual', {}).get('patch_map', False)
+        verbose = debug.get('verbose', {}).get('patch_generation', False)
+        magx_tilt_1 = patch_generation.get('magx_tilt_1', 0.0)
+        magx_tilt_2 = patch_generation.get('magx_tilt_2', 0.0)
+        pf_split_point_ratio = patch_generation.get('pf_split_point_ratio', 0.5)
+        pf_split_point_ratio = min(0.95, pf_split_point_ratio) if pf_split_point_ratio > 0 else max(0.05, pf_split_point_ratio)
 
         xpt1 = self.LineTracer.NSEW_lookup['xpt1']['coor']
         xpt2 = self.LineTracer.NSEW_lookup['xpt2']['coor']
 
-        magx = np.array([self.settings['grid_settings']['rmagx'] + self.settings['grid_settings']['patch_generation']['rmagx_shift'],
-            self.settings['grid_settings']['zmagx'] + self.settings['grid_settings']['patch_generation']['zmagx_shift']])
+        magx = np.array([self.settings['grid_settings']['rmagx'] + patch_generation['rmagx_shift'],
+            self.settings['grid_settings']['zmagx'] + patch_generation['zmagx_shift']])
 
         psi_1 = self.settings['grid_settings']['psi_1']
         psi_2 = self.settings['grid_settings']['psi_2']
@@ -159,7 +160,7 @@ class SF15(TopologyUtils):
         psi_pf_1 = self.settings['grid_settings']['psi_pf_1']
         psi_pf_2 = self.settings['grid_settings']['psi_pf_2']
 
-        if self.settings['grid_settings']['patch_generation']['strike_pt_loc'] == 'limiter':
+        if patch_generation['strike_pt_loc'] == 'limiter':
             WestPlate1 = self.parent.LimiterData.copy()
             WestPlate2 = self.parent.LimiterData.copy()
 
@@ -174,18 +175,11 @@ class SF15(TopologyUtils):
             EastPlate2 = self.PlateData['plate_E2']
 
         # Generate Horizontal Mid-Plane lines
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_1), magx[1] - 1e6 * np.sin(magx_tilt_1))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_1), magx[1] + 1e6 * np.sin(magx_tilt_1))
-        midline_1 = Line([LHS_Point, RHS_Point])
-
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_2), magx[1] - 1e6 * np.sin(magx_tilt_2))
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_2), magx[1] + 1e6 * np.sin(magx_tilt_2))
-        midline_2 = Line([LHS_Point, RHS_Point])
+        midline_1 = self._midline(magx, magx_tilt_1)
+        midline_2 = self._midline(magx, magx_tilt_2)
 
         # Generate Vertical Mid-Plane line
-        Lower_Point = Point(magx[0], magx[1] - 1e6)
-        Upper_Point = Point(magx[0], magx[1] + 1e6)
-        topLine = Line([Lower_Point, Upper_Point])
+        topLine = self._midline(magx, np.pi / 2)
 
         # Tracing primary-separatrix: core-boundary
 
@@ -310,15 +304,15 @@ class SF15(TopologyUtils):
         xpt2__midline_1__WestPlate1 = self.LineTracer.draw_line(xpt2__topLine__midline_1.p[-1], {'line': WestPlate1},
             option='theta', direction='ccw', show_plot=visual, text=verbose)
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_W']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_W_tilt']
+        if patch_generation['use_xpt1_W']:
+            tilt = patch_generation['xpt1_W_tilt']
             B2_W = self.LineTracer.draw_line(xpt1['W'], {'line':(xpt2__midline_1__WestPlate1, tilt)}, option='z_const', direction='ccw', show_plot=visual, text=verbose)
         else:
             B2_W = self.LineTracer.draw_line(xpt1['W'], {'line': xpt2__midline_1__WestPlate1}, option='rho', direction='ccw', show_plot=visual, text=verbose)
         A2_E = B2_W.reverse_copy()
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_E']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_E_tilt']
+        if patch_generation['use_xpt1_E']:
+            tilt = patch_generation['xpt1_E_tilt']
             I2_W = self.LineTracer.draw_line(xpt1['E'], {'line': (xpt2NW__EastPlate1, tilt)}, option='z_const', direction='cw', show_plot=visual, text=verbose)
         else:
             I2_W = self.LineTracer.draw_line(xpt1['E'], {'line': xpt2NW__EastPlate1}, option='rho', direction='ccw', show_plot=visual, text=verbose)
@@ -367,8 +361,8 @@ class SF15(TopologyUtils):
             show_plot=visual, text=verbose).reverse_copy()
         G3_S = G2_N.reverse_copy()
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt2_W']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt2_W_tilt']
+        if patch_generation['use_xpt2_W']:
+            tilt = patch_generation['xpt2_W_tilt']
             H3_W = self.LineTracer.draw_line(xpt2['W'],
                 {'psi_horizontal': (psi_2, tilt)},
                 option='z_const', direction='ccw',
@@ -390,8 +384,8 @@ class SF15(TopologyUtils):
         G3_N = self.LineTracer.draw_line(H3_W.p[-1], {'line': WestPlate2}, option='theta',
             direction='ccw', show_plot=visual, text=verbose).reverse_copy()
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt2_E']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt2_E_tilt']
+        if patch_generation['use_xpt2_E']:
+            tilt = patch_generation['xpt2_E_tilt']
             F3_W = self.LineTracer.draw_line(xpt2['E'],
                 {'psi_horizontal': (psi_1, tilt)},
                 option='z_const', direction='cw',
@@ -530,12 +524,7 @@ class SF15(TopologyUtils):
         patches = [A3, A2, A1, B3, B2, B1, C3, C2, C1, D3, D2, D1, E3, E2, E1,
                    F3, F2, F1, G3, G2, G1, H3, H2, H1, I3, I2, I1]
 
-        self.patches = {}
-        for patch in patches:
-            patch.parent = self
-            patch.PatchTagMap = self.PatchTagMap
-            self.patches[patch.patch_name] = patch
-        self.OrderPatches()
+        self.SetPatches(patches)
 
     def OrderPatches(self):
 
@@ -547,43 +536,6 @@ class SF15(TopologyUtils):
 
         self.patches = OrderedDict([(pname, self.patches[pname]) for pname in patches])
 
-    def AdjustPatch(self, patch):
-        xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
-        xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
-
-        tag = patch.get_tag()
-        if tag == 'A2':
-            patch.adjust_corner(xpt1, 'SE')
-        elif tag == 'A1':
-            patch.adjust_corner(xpt1, 'NE')
-        elif tag == 'B2':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'B1':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'H2':
-            patch.adjust_corner(xpt1, 'SE')
-            patch.adjust_corner(xpt2, 'NW')
-        elif tag == 'H1':
-            patch.adjust_corner(xpt1, 'NE')
-        elif tag == 'I2':
-            patch.adjust_corner(xpt1, 'SW')
-        elif tag == 'I1':
-            patch.adjust_corner(xpt1, 'NW')
-        elif tag == 'H3':
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'G3':
-            patch.adjust_corner(xpt2, 'SE')
-        elif tag == 'G2':
-            patch.adjust_corner(xpt2, 'NE')
-        elif tag == 'F2':
-            patch.adjust_corner(xpt2, 'NW')
-        elif tag == 'F3':
-            patch.adjust_corner(xpt2, 'SW')
-        elif tag == 'E3':
-            patch.adjust_corner(xpt2, 'SE')
-        elif tag == 'E2':
-            patch.adjust_corner(xpt2, 'NE')
-
     def GroupPatches(self):
         # p = self.patches
         # self.PatchGroup = {'SOL' : [],
@@ -642,36 +594,16 @@ class SF15(TopologyUtils):
             ix_plate4 += self.patches[alpha + '1'].npol - 1
         ix_plate4 += 2
 
-        psi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        br = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bz = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bpol = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bphi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        b = np.zeros((nxm + 2, nym + 2, 5), order='F')
-
-        rm = self.rm
-        zm = self.zm
+        rm = np.asarray(self.rm)
+        zm = np.asarray(self.zm)
         rb_prod = self.PsiUNorm.rcenter * self.PsiUNorm.bcenter
 
-        for i in range(len(b)):
-            for j in range(len(b[0])):
-                for k in range(5):
-                    _r = rm[i][j][k]
-                    _z = zm[i][j][k]
-
-                    _psi = self.PsiUNorm.get_psi(_r, _z)
-                    _br = self.PsiUNorm.get_psi(_r, _z, tag='vz') / _r
-                    _bz = -self.PsiUNorm.get_psi(_r, _z, tag='vr') / _r
-                    _bpol = np.sqrt(_br ** 2 + _bz ** 2)
-                    _bphi = rb_prod / _r
-                    _b = np.sqrt(_bpol ** 2 + _bphi ** 2)
-
-                    psi[i][j][k] = _psi
-                    br[i][j][k] = _br
-                    bz[i][j][k] = _bz
-                    bpol[i][j][k] = _bpol
-                    bphi[i][j][k] = _bphi
-                    b[i][j][k] = _b
+        psi = self.PsiUNorm.get_psi_vec(rm, zm)
+        br = self.PsiUNorm.get_psi_vec(rm, zm, tag='vz') / rm
+        bz = -self.PsiUNorm.get_psi_vec(rm, zm, tag='vr') / rm
+        bpol = np.sqrt(br ** 2 + bz ** 2)
+        bphi = rb_prod / rm
+        b = np.sqrt(bpol ** 2 + bphi ** 2)
 
         self.gridue_settings = {
             'nxm': nxm, 'nym': nym, 'iyseparatrix1': iyseparatrix1, 'iyseparatrix2': iyseparatrix2,
@@ -6,13 +6,7 @@ Child of base :class:`utils.TopologyUtils`.
 
 """
 import numpy as np
-import matplotlib
 import pathlib
-try:
-    matplotlib.use("TkAgg")
-except:
-    pass
-import matplotlib.pyplot as plt
 from INGRID.utils import TopologyUtils
 from INGRID.geometry import Point, Line, Patch, trim_geometry, rotate
 from collections import OrderedDict
@@ -58,6 +52,18 @@ class SNL(TopologyUtils):
             'F2': {'W': ('E2', 'E')},
         }
 
+        # Corners of patches that touch an x-point, snapped onto it by AdjustPatch.
+        self.XptCornerMap = {
+            'A2': (('xpt1', 'SE'),),
+            'A1': (('xpt1', 'NE'),),
+            'B2': (('xpt1', 'SW'),),
+            'B1': (('xpt1', 'NW'),),
+            'E1': (('xpt1', 'NE'),),
+            'E2': (('xpt1', 'SE'),),
+            'F1': (('xpt1', 'NW'),),
+            'F2': (('xpt1', 'SW'),),
+        }
+
     def AdjustGrid(self) -> None:
         """
         Adjust the grid so that no holes occur at x-points, and cell grid
@@ -92,51 +98,21 @@ class SNL(TopologyUtils):
             except:
                 pass
 
-    def AdjustPatch(self, patch):
-        primary_xpt = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
-
-        tag = patch.get_tag()
-        if tag == 'A2':
-            patch.adjust_corner(primary_xpt, 'SE')
-        elif tag == 'A1':
-            patch.adjust_corner(primary_xpt, 'NE')
-        elif tag == 'B2':
-            patch.adjust_corner(primary_xpt, 'SW')
-        elif tag == 'B1':
-            patch.adjust_corner(primary_xpt, 'NW')
-        elif tag == 'E1':
-            patch.adjust_corner(primary_xpt, 'NE')
-        elif tag == 'E2':
-            patch.adjust_corner(primary_xpt, 'SE')
-        elif tag == 'F1':
-            patch.adjust_corner(primary_xpt, 'NW')
-        elif tag == 'F2':
-            patch.adjust_corner(primary_xpt, 'SW')
-
     def construct_patches(self):
         """
         Create the Patch map with :class:`LineTracing`.
 
         """
 
-        try:
-            visual = self.settings['DEBUG']['visual']['patch_map']
-        except KeyError:
-            visual = False
-        try:
-            verbose = self.settings['DEBUG']['verbose']['patch_generation']
-        except KeyError:
-            verbose = False
-        try:
-            magx_tilt_1 = self.settings['grid_settings']['patch_generation']['magx_tilt_1']
-        except KeyError:
-            magx_tilt_1 = 0.0
-        try:
-            magx_tilt_2 = self.settings['grid_settings']['patch_generation']['magx_tilt_2']
-        except KeyError:
-            magx_tilt_2 = 0.0
-
-        if self.settings['grid_settings']['patch_generation']['strike_pt_loc'] == 'limiter':
+        debug = self.settings.get('DEBUG', {})
+        patch_generation = self.settings.get('grid_settings', {}).get('patch_generation', {})
+
+        visual = debug.get('visual', {}).get('patch_map', False)
+        verbose = debug.get('verbose', {}).get('patch_generation', False)
+        magx_tilt_1 = patch_generation.get('magx_tilt_1', 0.0)
+        magx_tilt_2 = patch_generation.get('magx_tilt_2', 0.0)
+
+        if patch_generation['strike_pt_loc'] == 'limiter':
             WestPlate = self.parent.LimiterData.copy()
             EastPlate = self.parent.LimiterData.copy()
 
@@ -145,28 +121,19 @@ class SNL(TopologyUtils):
             EastPlate = self.PlateData['plate_E1']
 
         xpt = self.LineTracer.NSEW_lookup['xpt1']['coor']
-        magx = np.array([self.settings['grid_settings']['rmagx'] + self.settings['grid_settings']['patch_generation']['rmagx_shift'],
-            self.settings['grid_settings']['zmagx'] + self.settings['grid_settings']['patch_generation']['zmagx_shift']])
+        magx = np.array([self.settings['grid_settings']['rmagx'] + patch_generation['rmagx_shift'],
+            self.settings['grid_settings']['zmagx'] + patch_generation['zmagx_shift']])
 
         psi_1 = self.settings['grid_settings']['psi_1']
         psi_core = self.settings['grid_settings']['psi_core']
         psi_pf_1 = self.settings['grid_settings']['psi_pf_1']
 
-        # Generate Horizontal Mid-Plane lines
-        LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_1), magx[1] - 1e6 * np.sin(magx_tilt_1))
-        # RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_1), magx[1] + 1e6 * np.sin(magx_tilt_1))
-        RHS_Point = Point(magx[0], magx[1])
-        midline_1 = Line([LHS_Point, RHS_Point])
-
-        # LHS_Point = Point(magx[0] - 1e6 * np.cos(magx_tilt_2), magx[1] - 1e6 * np.sin(magx_tilt_2))
-        LHS_Point = Point(magx[0], magx[1])
-        RHS_Point = Point(magx[0] + 1e6 * np.cos(magx_tilt_2), magx[1] + 1e6 * np.sin(magx_tilt_2))
-        midline_2 = Line([LHS_Point, RHS_Point])
+        # Generate Horizontal Mid-Plane lines (each ends at the magnetic axis)
+        midline_1 = self._midline(magx, magx_tilt_1, east=False)
+        midline_2 = self._midline(magx, magx_tilt_2, west=False)
 
         # Generate Vertical Mid-Plane line
-        Lower_Point = Point(magx[0], magx[1] - 1e6)
-        Upper_Point = Point(magx[0], magx[1] + 1e6)
-        topLine = Line([Lower_Point, Upper_Point])
+        topLine = self._midline(magx, np.pi / 2)
 
         # If USN, we swap east and west lines
         if self.config == 'USN':
@@ -180,15 +147,15 @@ class SNL(TopologyUtils):
         xptNE_midLine = self.LineTracer.draw_line(xpt['NE'], {'line': midline_2}, option='theta', direction='ccw', show_plot=visual, text=verbose)
 
         # Drawing Lower-SNL region
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_W']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_W_tilt']
+        if patch_generation['use_xpt1_W']:
+            tilt = patch_generation['xpt1_W_tilt']
             d = 'ccw'
             xptW_psiMax = self.LineTracer.draw_line(xpt['W'], {'psi_horizontal': (psi_1, tilt)}, option='z_const', direction=d, show_plot=visual, text=verbose)
         else:
             xptW_psiMax = self.LineTracer.draw_line(xpt['W'], {'psi': psi_1}, option='rho', direction='ccw', show_plot=visual, text=verbose)
 
-        if self.settings['grid_settings']['patch_generation']['use_xpt1_E']:
-            tilt = self.settings['grid_settings']['patch_generation']['xpt1_E_tilt']
+        if patch_generation['use_xpt1_E']:
+            tilt = patch_generation['xpt1_E_tilt']
             d = 'cw'
             xptE_psiMax = self.LineTracer.draw_line(xpt['E'], {'psi_horizontal': (psi_1, tilt)}, option='z_const', direction=d, show_plot=visual, text=verbose)
         else:
@@ -311,11 +278,7 @@ class SNL(TopologyUtils):
 
         patches = [A2, B2, C2, D2, E2, F2, A1, F1, B1, C1, D1, E1]
 
-        self.patches = {}
-        for patch in patches:
-            patch.PatchTagMap = self.PatchTagMap
-            self.patches[patch.patch_name] = patch
-        self.OrderPatches()
+        self.SetPatches(patches)
 
     def GroupPatches(self):
         p = self.patches
@@ -349,36 +312,16 @@ class SNL(TopologyUtils):
         nxm = len(self.rm) - 2
         nym = len(self.rm[0]) - 2
 
-        psi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        br = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bz = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bpol = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        bphi = np.zeros((nxm + 2, nym + 2, 5), order='F')
-        b = np.zeros((nxm + 2, nym + 2, 5), order='F')
-
-        rm = self.rm
-        zm = self.zm
+        rm = np.asarray(self.rm)
+        zm = np.asarray(self.zm)
         rb_prod = self.PsiUNorm.rcenter * self.PsiUNorm.bcenter
 
-        for i in range(len(b)):
-            for j in range(len(b[0])):
-                for k in range(5):
-                    _r = rm[i][j][k]
-                    _z = zm[i][j][k]
-
-                    _psi = self.PsiUNorm.get_psi(_r, _z)
-                    _br = self.PsiUNorm.get_psi(_r, _z, tag='vz') / _r
-                    _bz = -self.PsiUNorm.get_psi(_r, _z, tag='vr') / _r
-                    _bpol = np.sqrt(_br ** 2 + _bz ** 2)
-                    _bphi = rb_prod / _r
-                    _b = np.sqrt(_bpol ** 2 + _bphi ** 2)
-
-                    psi[i][j][k] = _psi
-                    br[i][j][k] = _br
-                    bz[i][j][k] = _bz
-                    bpol[i][j][k] = _bpol
-                    bphi[i][j][k] = _bphi
-                    b[i][j][k] = _b
+        psi = self.PsiUNorm.get_psi_vec(rm, zm)
+        br = self.PsiUNorm.get_psi_vec(rm, zm, tag='vz') / rm
+        bz = -self.PsiUNorm.get_psi_vec(rm, zm, tag='vr') / rm
+        bpol = np.sqrt(br ** 2 + bz ** 2)
+        bphi = rb_prod / rm
+        b = np.sqrt(bpol ** 2 + bphi ** 2)
 
         self.gridue_settings = {
             'nxm': nxm, 'nym': nym, 'ixpt1': ixpt1, 'ixpt2': ixpt2, 'iyseptrx1': iyseparatrix1,
@@ -15,15 +15,19 @@ try:
 except:
     pass
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Patch as MplPatch
 import pathlib
 import inspect
-from scipy.optimize import root, minimize
+from scipy.optimize import minimize
 
 import yaml as yml
 import os
 from pathlib import Path
 from time import time
 from collections import OrderedDict
+from types import MappingProxyType
 
 from INGRID.OMFITgeqdsk import OMFITgeqdsk
 from INGRID.interpol import EfitData
@@ -920,10 +924,9 @@ class IngridUtils():
         z : float
             Z coordinate of magnetic-axis guess.
         """
-        sol = root(self.PsiUNorm.Gradient, [r, z])
-        self.settings['grid_settings']['rmagx'] = sol.x[0]
-        self.settings['grid_settings']['zmagx'] = sol.x[1]
-        self.magx = (sol.x[0], sol.x[1])
+        self.magx = self.PsiUNorm.FindCriticalPoint((r, z))
+        self.settings['grid_settings']['rmagx'] = self.magx[0]
+        self.settings['grid_settings']['zmagx'] = self.magx[1]
 
     def FindXPoint(self, r: float, z: float) -> None:
         """
@@ -937,10 +940,9 @@ class IngridUtils():
         z : float
             Z coordinate of primary x-point guess.
         """
-        sol = root(self.PsiUNorm.Gradient, [r, z])
-        self.settings['grid_settings']['rxpt'] = sol.x[0]
-        self.settings['grid_settings']['zxpt'] = sol.x[1]
-        self.xpt1 = (sol.x[0], sol.x[1])
+        self.xpt1 = self.PsiUNorm.FindCriticalPoint((r, z))
+        self.settings['grid_settings']['rxpt'] = self.xpt1[0]
+        self.settings['grid_settings']['zxpt'] = self.xpt1[1]
 
     def FindXPoint2(self, r: float, z: float) -> None:
         """
@@ -954,10 +956,9 @@ class IngridUtils():
         z : float
             Z coordinate of secondary x-point guess.
         """
-        sol = root(self.PsiUNorm.Gradient, [r, z])
-        self.settings['grid_settings']['rxpt2'] = sol.x[0]
-        self.settings['grid_settings']['zxpt2'] = sol.x[1]
-        self.xpt2 = (sol.x[0], sol.x[1])
+        self.xpt2 = self.PsiUNorm.FindCriticalPoint((r, z))
+        self.settings['grid_settings']['rxpt2'] = self.xpt2[0]
+        self.settings['grid_settings']['zxpt2'] = self.xpt2[1]
 
     def _find_roots(self, tk_controller=None):
         """ Displays a plot, and has the user click on an approximate
@@ -1359,6 +1360,10 @@ class TopologyUtils():
     ConnexionMap : dict
         A mapping describing how Patch objects are connected to each other (see notes).
 
+    XptCornerMap : dict
+        A mapping from Patch tag to the (x-point, corner) pairs snapped onto
+        x-points by ``AdjustPatch``.
+
     CorrectDistortion : dict
         The settings to be used for correcting grid shearing.
 
@@ -1381,6 +1386,15 @@ class TopologyUtils():
         Parent PsiNorm instance.
 
     """
+    # Patch map palette: fill color keyed by the first character of a patch
+    # tag and opacity keyed by the last one. The RGB values are resolved once
+    # here rather than for every patch drawn.
+    PATCH_COLORS = {'A': 'red', 'B': 'blue', 'C': 'navajowhite', 'D': 'firebrick',
+                    'E': 'magenta', 'F': 'olivedrab', 'G': 'darkorange', 'H': 'yellow', 'I': 'navy'}
+    PATCH_ALPHA = {'3': 1.0, '2': 0.75, '1': 0.5}
+    PATCH_RGB = {key: to_rgba(color)[:3] for key, color in PATCH_COLORS.items()}
+    NO_DISTORTION_CORRECTION = MappingProxyType({'active': False})
+
     def __init__(self, Ingrid_obj: object, config: str):
         self.parent = Ingrid_obj
         self.config = config
@@ -1392,16 +1406,68 @@ class TopologyUtils():
         self.PsiNorm = Ingrid_obj.PsiNorm
         self.CurrentListPatch = {}
         self.ConnexionMap = {}
+        self.XptCornerMap = {}
         self.Verbose = False
+        self._lambdified = {}
+        self._concat_layouts = {}
         self.GetDistortionCorrectionSettings()
 
     def RefreshSettings(self):
         self.settings = self.parent.settings
 
+    def _midline(self, origin: tuple, tilt: float = 0.0, west: bool = True, east: bool = True) -> Line:
+        """
+        Straight line through `origin` spanning the whole computational domain.
+
+        The half-length is twice the domain diagonal, which is long enough for
+        any tracing target inside the domain while keeping the line-crossing
+        tests well conditioned.
+
+        Parameters
+        ----------
+        origin : array-like
+            (R, Z) coordinate the line passes through.
+        tilt : float, optional
+            Angle of the line with respect to the R axis, in radians.
+        west : bool, optional
+            Extend the line backwards (towards -R for tilt 0) from `origin`.
+            Otherwise the line starts at `origin`.
+        east : bool, optional
+            Extend the line forwards (towards +R for tilt 0) from `origin`.
+            Otherwise the line ends at `origin`.
+
+        Returns
+        -------
+            A Line made of two Points.
+        """
+        grid = self.PsiUNorm
+        reach = 2 * np.hypot(grid.rmax - grid.rmin, grid.zmax - grid.zmin)
+        dx, dy = reach * np.cos(tilt), reach * np.sin(tilt)
+        r, z = origin[0], origin[1]
+        start = Point(r - dx, z - dy) if west else Point(r, z)
+        end = Point(r + dx, z + dy) if east else Point(r, z)
+        return Line([start, end])
+
+    def SetPatches(self, patches: list) -> None:
+        """
+        Register the Patch objects built by construct_patches.
+
+        Parameters
+        ----------
+        patches : list
+            The Patch objects of the configuration.
+        """
+        tag_map = self.PatchTagMap
+        for patch in patches:
+            patch.parent = self
+            patch.PatchTagMap = tag_map
+        self.patches = {patch.patch_name: patch for patch in patches}
+        self.OrderPatches()
+
     def OrderPatches(self):
         pass
 
-    def patch_diagram(self, fig: object = None, ax: object = None) -> None:
+    def patch_diagram(self, fig: object = None, ax: object = None, show: bool = False) -> object:
         """
         Generate the patch diagram for a given configuration.
 
@@ -1413,15 +1479,26 @@ class TopologyUtils():
         ax : object, optional
             Matplotlib axes to plot the Patch map on.
 
-        """
+        show : bool, optional
+            Display the figure once drawn. Leave False in batch runs
+            and save the returned figure instead.
 
-        colors = {'A': 'red', 'B': 'blue', 'C': 'navajowhite', 'D': 'firebrick',
-                  'E': 'magenta', 'F': 'olivedrab', 'G': 'darkorange', 'H': 'yellow', 'I': 'navy'}
-        alpha = {'3': 1.0, '2': 0.75, '1': 0.5}
+        Returns
+        -------
+            The matplotlib figure holding the Patch map.
+        """
 
         f = fig if fig else plt.figure('INGRID Patch Map', figsize=(6, 10))
         f.subplots_adjust(bottom=0.2)
-        a = ax if ax else f.subplots(1, 1)
+        if ax:
+            a = ax
+        elif fig is None and f.axes:
+            # plt.figure returns the existing 'INGRID Patch Map' figure on
+            # repeated calls, so clear its axes rather than stacking new ones.
+            a = f.axes[0]
+            a.cla()
+        else:
+            a = f.subplots(1, 1)
         a.set_xlim([self.PsiUNorm.rmin, self.PsiUNorm.rmax])
         a.set_ylim([self.PsiUNorm.zmin, self.PsiUNorm.zmax])
         a.set_aspect('equal', adjustable='box')
@@ -1430,16 +1507,28 @@ class TopologyUtils():
         a.set_ylabel('Z')
         a.set_title(f'{self.config} Patch Diagram')
 
-        for i, patch in enumerate(self.patches.values()):
-            patch.plot_border(color='black', ax=a)
-            patch.fill(colors[patch.get_tag()[0]], ax=a, alpha=alpha[patch.get_tag()[-1]])
-            patch.color = colors[patch.get_tag()[0]]
+        # Gather every patch outline and border into one collection each
+        # so matplotlib draws the map in two artists instead of ~100.
+        polygons, facecolors, borders = [], [], []
         handles, labels = a.get_legend_handles_labels()
+        for patch in self.patches.values():
+            tag = patch.get_tag()
+            patch.color = self.PATCH_COLORS[tag[0]]
+            rgba = self.PATCH_RGB[tag[0]] + (self.PATCH_ALPHA[tag[-1]],)
+            polygons.append([p.coor for p in patch.p])
+            facecolors.append(rgba)
+            borders.extend(line.as_np().T for line in patch.lines)
+            handles.append(MplPatch(color=rgba, label=tag))
+            labels.append(tag)
+        a.add_collection(PolyCollection(polygons, facecolors=facecolors, edgecolors=facecolors))
+        a.add_collection(LineCollection(borders, colors='black', linewidths=0.5, zorder=5))
         lookup = {label: handle for label, handle in zip(labels, handles)}
         a.legend(handles=[handle for handle in lookup.values()], labels=[label for label in lookup.keys()],
                  bbox_to_anchor=(1.25, 1.0), loc='upper right',
                  ncol=1)
-        f.show()
+        if show:
+            f.show()
+        return f
 
     def grid_diagram(self, fig: object = None, ax: object = None) -> None:
         """
@@ -1565,12 +1654,18 @@ class TopologyUtils():
         f_str_raw = func
 
         f_str_raw = f_str_raw.replace(' ', '')
+
+        # Patches sharing a transformation reuse the lambdified function.
+        if f_str_raw in self._lambdified:
+            return self._lambdified[f_str_raw]
+
         delim = f_str_raw.index(',')
 
         var = f_str_raw[0: delim]
         expression = f_str_raw[delim + 1:]
 
         func = make_sympy_func(var, expression)
+        self._lambdified[f_str_raw] = func
         # TODO: Check Normalization of the function to 1
         return func
 
@@ -1626,16 +1721,17 @@ class TopologyUtils():
         poloidal_tag, radial_tag = Patch.get_tag()
         p_f = 'poloidal_f_' + poloidal_tag
         r_f = 'radial_f_' + radial_tag
+        grid_generation = self.settings['grid_settings']['grid_generation']
 
         try:
-            _poloidal_f = self.settings['grid_settings']['grid_generation'][p_f]
+            _poloidal_f = grid_generation[p_f]
             valid_function = self.CheckFunction(_poloidal_f, Verbose)
             if valid_function:
                 _poloidal_f = self.get_func(_poloidal_f)
             else:
                 raise ValueError('# Invalid function entry. Applying default poloidal function.')
         except:
-            _poloidal_f = self.settings['grid_settings']['grid_generation']['poloidal_f_default']
+            _poloidal_f = grid_generation['poloidal_f_default']
             valid_function = self.CheckFunction(_poloidal_f, Verbose)
             if valid_function:
                 _poloidal_f = self.get_func(_poloidal_f)
@@ -1646,18 +1742,18 @@ class TopologyUtils():
 
             # Adding CORE radial_f support for SNL cases via entry 'radial_f_3'
             if self.config in ['USN', 'LSN'] \
-                and self.settings['grid_settings']['grid_generation'].get('radial_f_3') is not None \
+                and grid_generation.get('radial_f_3') is not None \
                     and poloidal_tag + radial_tag in ['B1', 'C1', 'D1', 'E1']:
-                _radial_f = self.settings['grid_settings']['grid_generation']['radial_f_3']
+                _radial_f = grid_generation['radial_f_3']
             else:
-                _radial_f = self.settings['grid_settings']['grid_generation'][r_f]
+                _radial_f = grid_generation[r_f]
             valid_function = self.CheckFunction(_radial_f, Verbose)
             if valid_function:
                 _radial_f = self.get_func(_radial_f)
             else:
                 raise ValueError('# Invalid function entry. Applying default radial function.')
         except:
-            _radial_f = self.settings['grid_settings']['grid_generation']['radial_f_default']
+            _radial_f = grid_generation['radial_f_default']
             valid_function = self.CheckFunction(_radial_f, Verbose)
             if valid_function:
                 _radial_f = self.get_func(_radial_f)
@@ -1686,15 +1782,10 @@ class TopologyUtils():
         poloidal_tag, radial_tag = Patch.get_tag()
         np_tag = 'np_' + poloidal_tag
         nr_tag = 'nr_' + radial_tag
-        try:
-            np_cells = self.settings['grid_settings']['grid_generation'][np_tag]
-        except:
-            np_cells = self.settings['grid_settings']['grid_generation']['np_default']
+        grid_generation = self.settings['grid_settings']['grid_generation']
 
-        try:
-            nr_cells = self.settings['grid_settings']['grid_generation'][nr_tag]
-        except:
-            nr_cells = self.settings['grid_settings']['grid_generation']['nr_default']
+        np_cells = grid_generation[np_tag] if np_tag in grid_generation else grid_generation['np_default']
+        nr_cells = grid_generation[nr_tag] if nr_tag in grid_generation else grid_generation['nr_default']
 
         return (nr_cells, np_cells)
 
@@ -1782,14 +1873,9 @@ class TopologyUtils():
         # Plot borders and fill patches.
         if Verbose:
             print('Construct Grid')
-        try:
-            visual = self.settings['DEBUG']['visual']['subgrid']
-        except:
-            visual = False
-        try:
-            verbose = self.settings['DEBUG']['verbose']['grid_generation']
-        except:
-            verbose = False
+        debug = self.settings.get('DEBUG', {})
+        visual = debug.get('visual', {}).get('subgrid', False)
+        verbose = debug.get('verbose', {}).get('grid_generation', False)
 
         verbose = Verbose or verbose
 
@@ -1799,24 +1885,38 @@ class TopologyUtils():
         if RestartScratch:
             self.CurrentListPatch = {}
 
+        # Source of each transformation, printed for every patch using it.
+        func_source = {}
+
+        def get_source(f):
+            if f not in func_source:
+                func_source[f] = inspect.getsource(f)
+            return func_source[f]
+
+        if ListPatches != 'all':
+            ListPatches = {ListPatches} if isinstance(ListPatches, str) else set(ListPatches)
+
+        distortion_correction = self.distortion_correction
+        default_correction = distortion_correction.get('all')
+        if default_correction is None:
+            default_correction = self.NO_DISTORTION_CORRECTION
+
         for name, patch in self.patches.items():
 
-            if self.distortion_correction.get(name) is not None:
-                patch.distortion_correction = self.distortion_correction.get(name)
-            elif self.distortion_correction.get(patch.get_tag()) is not None:
-                patch.distortion_correction = self.distortion_correction.get(patch.get_tag())
-            elif self.distortion_correction.get('all') is not None:
-                patch.distortion_correction = self.distortion_correction.get('all')
-            else:
-                patch.distortion_correction = {'Active': False}
+            correction = distortion_correction.get(name)
+            if correction is None:
+                correction = distortion_correction.get(patch.get_tag())
+            if correction is None:
+                correction = default_correction
+            patch.distortion_correction = correction
             if (ListPatches == 'all' and patch not in self.CurrentListPatch) or (ListPatches != 'all' and name in ListPatches):
                 self.SetPatchBoundaryPoints(patch, verbose)
                 (nr_cells, np_cells) = self.GetNpoints(patch)
                 (_radial_f, _poloidal_f) = self.GetFunctions(patch)
                 print(f'>>> Making subgrid in patch {name}:')
                 print(f'    np = {np_cells}, nr = {nr_cells}')
-                print(f'    fp = {inspect.getsource(_poloidal_f)}')
-                print(f'    fr = {inspect.getsource(_radial_f)}', end='')
+                print(f'    fp = {get_source(_poloidal_f)}')
+                print(f'    fr = {get_source(_radial_f)}', end='')
                 patch.RemoveDuplicatePoints()
                 patch.make_subgrid(self, np_cells, nr_cells, _poloidal_f=_poloidal_f, _radial_f=_radial_f, verbose=verbose, visual=visual, ShowVertices=ShowVertices)
 
@@ -1824,6 +1924,25 @@ class TopologyUtils():
                 print(f'    {name} subgrid complete.\n\n')
         self.AdjustGrid()
 
+    def AdjustPatch(self, patch: Patch) -> None:
+        """
+        Snap the corners of a Patch that touch an x-point onto that x-point.
+
+        Line tracing starts a small epsilon away from x-points, which leaves
+        holes in the grid. The affected corners are listed per Patch tag in
+        the topology ``XptCornerMap``.
+
+        Parameters
+        ----------
+        patch : Patch
+            The Patch to adjust (nothing is done if it is not next to an x-point).
+        """
+        xpt_points = {}
+        for xpt_ID, corner in self.XptCornerMap.get(patch.get_tag(), ()):
+            if xpt_ID not in xpt_points:
+                xpt_points[xpt_ID] = Point(self.LineTracer.NSEW_lookup[xpt_ID]['coor']['center'])
+            patch.adjust_corner(xpt_points[xpt_ID], corner)
+
     def SetPatchBoundaryPoints(self, Patch: Patch, verbose: bool = False) -> None:
         """
         Set the Patch ``BoundaryPoints`` dict based off TopologyUtils ``ConnexionMap``.
@@ -1841,15 +1960,15 @@ class TopologyUtils():
         lookup what is adjacent to the Patch parameter being operated on.
         """
         Patch.TerminatesLoop = False
-        if self.ConnexionMap.get(Patch.get_tag()) is not None:
+        connexions = self.ConnexionMap.get(Patch.get_tag())
+        if connexions is not None:
             if verbose:
                 print('Find connexion map for patch {}'.format(Patch.patch_name))
-            for v in self.ConnexionMap.get(Patch.get_tag()).items():
-                Boundary, AdjacentPatch = v
+            for Boundary, AdjacentPatch in connexions.items():
                 Patch.BoundaryPoints[Boundary] = self.GetBoundaryPoints(AdjacentPatch)
                 if verbose:
                     print('Find Boundaries points for {}'.format(Patch.patch_name))
-            if self.ConnexionMap.get(Patch.get_tag()).get('E') is not None:
+            if connexions.get('E') is not None:
                 Patch.TerminatesLoop = True
 
     def GetBoundaryPoints(self, AdjacentPatchInfo: tuple) -> list:
@@ -1870,16 +1989,17 @@ class TopologyUtils():
         if AdjacentPatchInfo is not None:
             PatchTag = AdjacentPatchInfo[0]
             Boundary = AdjacentPatchInfo[1]
-            for patch in self.patches.values():
-                if patch.get_tag() == PatchTag:
-                    if Boundary == 'S':
-                        return patch.S_vertices
-                    elif Boundary == 'N':
-                        return patch.N_vertices
-                    elif Boundary == 'E':
-                        return patch.E_vertices
-                    elif Boundary == 'W':
-                        return patch.W_vertices
+            # Patches are stored by name; PatchTagMap maps tags to names.
+            patch = self.patches.get(self.PatchTagMap.get(PatchTag))
+            if patch is not None:
+                if Boundary == 'S':
+                    return patch.S_vertices
+                elif Boundary == 'N':
+                    return patch.N_vertices
+                elif Boundary == 'E':
+                    return patch.E_vertices
+                elif Boundary == 'W':
+                    return patch.W_vertices
         return None
 
     def CheckPatches(self, verbose: bool = False) -> None:
@@ -1917,40 +2037,87 @@ class TopologyUtils():
 
         if self.config in ['LSN', 'USN']:
             self.patch_matrix = [
-                [[None], [None], [None], [None], [None], [None], [None], [None]],
-                [[None], p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], [None]],
-                [[None], p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], [None]],
-                [[None], [None], [None], [None], [None], [None], [None], [None]]
+                [None, None, None, None, None, None, None, None],
+                [None, p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], None],
+                [None, p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], None],
+                [None, None, None, None, None, None, None, None]
             ]
 
         elif self.config in ['SF45', 'SF75', 'SF105', 'SF135']:
             self.patch_matrix = [
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]],
-                [[None], p['A3'], p['B3'], p['C3'], p['D3'], p['E3'], p['F3'], p['G3'], [None], [None], p['H3'], p['I3'], [None]],
-                [[None], p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], p['G2'], [None], [None], p['H2'], p['I2'], [None]],
-                [[None], p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], p['G1'], [None], [None], p['H1'], p['I1'], [None]],
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]]
+                [None, None, None, None, None, None, None, None, None, None, None, None, None],
+                [None, p['A3'], p['B3'], p['C3'], p['D3'], p['E3'], p['F3'], p['G3'], None, None, p['H3'], p['I3'], None],
+                [None, p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], p['G2'], None, None, p['H2'], p['I2'], None],
+                [None, p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], p['G1'], None, None, p['H1'], p['I1'], None],
+                [None, None, None, None, None, None, None, None, None, None, None, None, None]
             ]
         elif self.config in ['SF15', 'SF165']:
             self.patch_matrix = [
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]],
-                [[None], p['A3'], p['B3'], p['C3'], p['D3'], p['E3'], p['F3'], [None], [None], p['G3'], p['H3'], p['I3'], [None]],
-                [[None], p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], [None], [None], p['G2'], p['H2'], p['I2'], [None]],
-                [[None], p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], [None], [None], p['G1'], p['H1'], p['I1'], [None]],
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]]
+                [None, None, None, None, None, None, None, None, None, None, None, None, None],
+                [None, p['A3'], p['B3'], p['C3'], p['D3'], p['E3'], p['F3'], None, None, p['G3'], p['H3'], p['I3'], None],
+                [None, p['A2'], p['B2'], p['C2'], p['D2'], p['E2'], p['F2'], None, None, p['G2'], p['H2'], p['I2'], None],
+                [None, p['A1'], p['B1'], p['C1'], p['D1'], p['E1'], p['F1'], None, None, p['G1'], p['H1'], p['I1'], None],
+                [None, None, None, None, None, None, None, None, None, None, None, None, None]
             ]
 
         elif self.config in ['UDN']:
             self.patch_matrix = [
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]],
-                [[None], p['A3'], p['B3'], p['C3'], p['D3'], [None], [None], p['E3'], p['F3'], p['G3'], p['H3'], [None]],
-                [[None], p['A2'], p['B2'], p['C2'], p['D2'], [None], [None], p['E2'], p['F2'], p['G2'], p['H2'], [None]],
-                [[None], p['A1'], p['B1'], p['C1'], p['D1'], [None], [None], p['E1'], p['F1'], p['G1'], p['H1'], [None]],
-                [[None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None], [None]]
+                [None, None, None, None, None, None, None, None, None, None, None, None],
+                [None, p['A3'], p['B3'], p['C3'], p['D3'], None, None, p['E3'], p['F3'], p['G3'], p['H3'], None],
+                [None, p['A2'], p['B2'], p['C2'], p['D2'], None, None, p['E2'], p['F2'], p['G2'], p['H2'], None],
+                [None, p['A1'], p['B1'], p['C1'], p['D1'], None, None, p['E1'], p['F1'], p['G1'], p['H1'], None],
+                [None, None, None, None, None, None, None, None, None, None, None, None]
             ]
 
         return self.patch_matrix
 
+    def _concat_layout(self, ixp_first: int, ixp_last: int, jyp_last: int) -> list:
+        """
+        Placement of each Patch of the patch matrix within the global grid.
+
+        The layout only depends on the topology and on the number of cells
+        in each Patch, so it is cached against those sizes and reused when
+        the grid is regenerated with unchanged refinement.
+
+        Parameters
+        ----------
+        ixp_first : int
+            First poloidal patch index (column) of the patch matrix to place.
+        ixp_last : int
+            Poloidal patch index to stop before.
+        jyp_last : int
+            Radial patch index to stop before. Radial indices start at 1.
+
+        Returns
+        -------
+            A list of (ixcell, jycell, Patch) tuples with the global poloidal
+            and radial index of the first cell of each Patch. Guard cell
+            entries of the patch matrix (denoted by None) are skipped.
+        """
+        patch_matrix = self.patch_matrix
+        sizes = tuple(tuple(None if patch_matrix[jyp][ixp] is None
+                            else (patch_matrix[jyp][ixp].npol, patch_matrix[jyp][ixp].nrad)
+                            for jyp in range(1, jyp_last))
+                      for ixp in range(ixp_first, ixp_last))
+        signature = (ixp_first, jyp_last, sizes)
+
+        layout = self._concat_layouts.get(signature)
+        if layout is None:
+            layout = []
+            ix_end = 0
+            for ixp, column in enumerate(sizes, ixp_first):
+                # Poloidal index of the last cell in this column of patches.
+                ix_end += column[0][0] - 1
+                nr_sum = 0
+                for jyp, size in enumerate(column, 1):
+                    if size is None:
+                        continue
+                    npol, nrad = size
+                    nr_sum += nrad - 1
+                    layout.append((ix_end - (npol - 1) + 1, nr_sum - (nrad - 1) + 1, jyp, ixp))
+            self._concat_layouts[signature] = layout
+        return [(ixcell, jycell, patch_matrix[jyp][ixp]) for ixcell, jycell, jyp, ixp in layout]
+
     def concat_grid(self, guard_cell_eps: float = 1e-3) -> None:
         """
         Concatenate a refined Patch map into a global grid.
@@ -2039,43 +2206,22 @@ class TopologyUtils():
             np_total = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][1:-1]])) + 2
             nr_total = int(np.sum([patch[1].nrad - 1 for patch in patch_matrix[1:3]])) + 2
 
-            rm = np.zeros((np_total, nr_total, 5), order='F')
-            zm = np.zeros((np_total, nr_total, 5), order='F')
-
-            ixcell = 0
-            jycell = 0
-
-            # Iterate over all the patches in our SNL configuration (we exclude guard cells denoted by '[None]')
-            for ixp in range(1, 7):
-
-                nr_sum = 0
-                for jyp in range(1, 3):
-                    # Point to the current patch we are operating on.
-                    local_patch = patch_matrix[jyp][ixp]
-                    nr_sum += local_patch.nrad - 1
-
-                    # Access the grid that is contained within this local_patch.
-                    # ixl - number of poloidal cells in the patch.
-                    for ixl in range(len(local_patch.cell_grid[0])):
-                        # jyl - number of radial cells in the patch
-                        for jyl in range(len(local_patch.cell_grid)):
-
-                            ixcell = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][1:ixp + 1]])) \
-                                - len(local_patch.cell_grid[0]) + ixl + 1
+            # R and Z vertex coordinates share one buffer (last axis).
+            rz = np.zeros((np_total, nr_total, 5, 2))
+            rm = rz[..., 0]
+            zm = rz[..., 1]
 
-                            jycell = nr_sum - (local_patch.nrad - 1) + jyl + 1
+            # Iterate over all the patches in our SNL configuration (we exclude guard cells denoted by None)
+            for ixcell, jycell, local_patch in self._concat_layout(1, 7, 3):
+                ixl = local_patch.npol - 1
+                jyl = local_patch.nrad - 1
 
-                            ind = 0
-                            for coor in ['CENTER', 'SW', 'SE', 'NW', 'NE']:
-                                rm[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].x
-                                zm[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].y
-                                ind += 1
+                # Copy all cell vertices of the patch as one block.
+                rz[ixcell:ixcell + ixl, jycell:jycell + jyl] = local_patch.cell_grid_as_rz().transpose(1, 0, 2, 3)
 
             # Flip indices into gridue format.
-            for i in range(len(rm)):
-                rm[i] = rm[i][::-1]
-            for i in range(len(zm)):
-                zm[i] = zm[i][::-1]
+            rm = rm[:, ::-1]
+            zm = zm[:, ::-1]
 
             # Add guard cells to the concatenated grid.
             ixrb = len(rm) - 2
@@ -2083,10 +2229,7 @@ class TopologyUtils():
             self.rm = _add_guardc(rm, ixlb, ixrb)
             self.zm = _add_guardc(zm, ixlb, ixrb)
 
-            try:
-                debug = self.settings['DEBUG']['visual']['gridue']
-            except:
-                debug = False
+            debug = self.settings.get('DEBUG', {}).get('visual', {}).get('gridue', False)
 
             if debug:
                 self._animate_grid()
@@ -2118,85 +2261,39 @@ class TopologyUtils():
             # Total number of radial indices in all subgrids.
             nr_total2 = int(np.sum([patch[pindex2].nrad - 1 for patch in patch_matrix[1:4]])) + 2
 
-            rm1 = np.zeros((np_total1, nr_total1, 5), order='F')
-            zm1 = np.zeros((np_total1, nr_total1, 5), order='F')
-            rm2 = np.zeros((np_total2, nr_total2, 5), order='F')
-            zm2 = np.zeros((np_total2, nr_total2, 5), order='F')
-
-            ixcell = 0
-            jycell = 0
+            assert nr_total1 == nr_total2, \
+                f'# Both halves of the {self.config} grid must have the same number of radial cells ' \
+                f'(got {nr_total1 - 2} and {nr_total2 - 2}).'
 
-            # Iterate over all the patches in our DNL configuration (we exclude guard cells denoted by '[None]')
-            for ixp in range(1, pindex1):
+            # Both halves of the grid span the same radial indices and are
+            # stacked poloidally, so they share one buffer and need no final
+            # concatenation. R and Z coordinates are on the last axis.
+            rz = np.zeros((np_total1 + np_total2, nr_total1, 5, 2))
+            rz1 = rz[:np_total1]
+            rz2 = rz[np_total1:]
+            rm1, zm1 = rz1[..., 0], rz1[..., 1]
+            rm2, zm2 = rz2[..., 0], rz2[..., 1]
 
-                nr_sum = 0
-                for jyp in range(1, 4):
-                    # Point to the current patch we are operating on.
-                    local_patch = patch_matrix[jyp][ixp]
-
-                    if local_patch == [None]:
-                        continue
+            # Iterate over all the patches in our DNL configuration (we exclude guard cells denoted by None)
+            for ixcell, jycell, local_patch in self._concat_layout(1, pindex1, 4):
+                ixl = local_patch.npol - 1
+                jyl = local_patch.nrad - 1
 
-                    nr_sum += local_patch.nrad - 1
+                # Copy all cell vertices of the patch as one block.
+                rz1[ixcell:ixcell + ixl, jycell:jycell + jyl] = local_patch.cell_grid_as_rz().transpose(1, 0, 2, 3)
 
-                    # Access the grid that is contained within this local_patch.
-                    # ixl - number of poloidal cells in the patch.
-                    for ixl in range(len(local_patch.cell_grid[0])):
-                        # jyl - number of radial cells in the patch
-                        for jyl in range(len(local_patch.cell_grid)):
+            for ixcell, jycell, local_patch in self._concat_layout(pindex2, pindex3, 4):
+                ixl = local_patch.npol - 1
+                jyl = local_patch.nrad - 1
 
-                            ixcell = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][1:ixp + 1]])) \
-                                - len(local_patch.cell_grid[0]) + ixl + 1
-
-                            jycell = nr_sum - (local_patch.nrad - 1) + jyl + 1
-
-                            ind = 0
-                            for coor in ['CENTER', 'SW', 'SE', 'NW', 'NE']:
-                                rm1[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].x
-                                zm1[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].y
-                                ind += 1
-
-            ixcell = 0
-            jycell = 0
-
-            for ixp in range(pindex2, pindex3):
-
-                nr_sum = 0
-                for jyp in range(1, 4):
-                    # Point to the current patch we are operating on.
-                    local_patch = patch_matrix[jyp][ixp]
-
-                    if local_patch == [None]:
-                        continue
-
-                    nr_sum += local_patch.nrad - 1
-
-                    # Access the grid that is contained within this local_patch.
-                    # ixl - number of poloidal cells in the patch.
-                    for ixl in range(len(local_patch.cell_grid[0])):
-                        # jyl - number of radial cells in the patch
-                        for jyl in range(len(local_patch.cell_grid)):
-
-                            ixcell = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][pindex2:ixp + 1]])) \
-                                - len(local_patch.cell_grid[0]) + ixl + 1
-
-                            jycell = nr_sum - (local_patch.nrad - 1) + jyl + 1
-
-                            ind = 0
-                            for coor in ['CENTER', 'SW', 'SE', 'NW', 'NE']:
-                                rm2[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].x
-                                zm2[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].y
-                                ind += 1
+                # Copy all cell vertices of the patch as one block.
+                rz2[ixcell:ixcell + ixl, jycell:jycell + jyl] = local_patch.cell_grid_as_rz().transpose(1, 0, 2, 3)
 
             # Flip indices into gridue format.
-            for i in range(len(rm1)):
-                rm1[i] = rm1[i][::-1]
-            for i in range(len(zm1)):
-                zm1[i] = zm1[i][::-1]
-            for i in range(len(rm2)):
-                rm2[i] = rm2[i][::-1]
-            for i in range(len(zm2)):
-                zm2[i] = zm2[i][::-1]
+            rm1 = rm1[:, ::-1]
+            zm1 = zm1[:, ::-1]
+            rm2 = rm2[:, ::-1]
+            zm2 = zm2[:, ::-1]
 
             # Add guard cells to the concatenated grid.
             ixrb1 = len(rm1) - 2
@@ -2209,13 +2306,10 @@ class TopologyUtils():
             rm2 = _add_guardc(rm2, ixlb2, ixrb2)
             zm2 = _add_guardc(zm2, ixlb2, ixrb2)
 
-            self.rm = np.concatenate((rm1, rm2))
-            self.zm = np.concatenate((zm1, zm2))
+            self.rm = rz[:, ::-1, :, 0]
+            self.zm = rz[:, ::-1, :, 1]
 
-            try:
-                debug = self.yaml['DEBUG']['visual']['gridue']
-            except:
-                debug = False
+            debug = self.settings.get('DEBUG', {}).get('visual', {}).get('gridue', False)
 
             if debug:
                 self._animate_grid()
@@ -0,0 +1,357 @@
+import pytest
+from types import SimpleNamespace
+from INGRID.geometry import Point
+from INGRID.topologies.snl import SNL
+from INGRID.topologies.sf15 import SF15
+from INGRID.topologies.sf45 import SF45
+from INGRID.topologies.sf75 import SF75
+from INGRID.topologies.sf105 import SF105
+from INGRID.topologies.sf135 import SF135
+from INGRID.topologies.sf165 import SF165
+from INGRID.topologies.udn import UDN
+
+
+def _adjust_patch_snl(self, patch):
+    """
+    Original SNL.AdjustPatch.
+    """
+    primary_xpt = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A2':
+        patch.adjust_corner(primary_xpt, 'SE')
+    elif tag == 'A1':
+        patch.adjust_corner(primary_xpt, 'NE')
+    elif tag == 'B2':
+        patch.adjust_corner(primary_xpt, 'SW')
+    elif tag == 'B1':
+        patch.adjust_corner(primary_xpt, 'NW')
+    elif tag == 'E1':
+        patch.adjust_corner(primary_xpt, 'NE')
+    elif tag == 'E2':
+        patch.adjust_corner(primary_xpt, 'SE')
+    elif tag == 'F1':
+        patch.adjust_corner(primary_xpt, 'NW')
+    elif tag == 'F2':
+        patch.adjust_corner(primary_xpt, 'SW')
+
+
+def _adjust_patch_sf15(self, patch):
+    """
+    Original SF15.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'A1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'B1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt1, 'SE')
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'H1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'I2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'I1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'H3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'G3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'F3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'E3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'E2':
+        patch.adjust_corner(xpt2, 'NE')
+
+
+def _adjust_patch_sf45(self, patch):
+    """
+    Original SF45.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'A1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'B1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'E2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'E1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'F3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt1, 'SW')
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'F1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'G3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'H3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt2, 'NE')
+
+
+def _adjust_patch_sf75(self, patch):
+    """
+    Original SF75.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A3':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'A2':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'B3':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'E3':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'E2':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'F3':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt1, 'NW')
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'F1':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'G1':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'H1':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'I2':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'I1':
+        patch.adjust_corner(xpt2, 'NW')
+
+
+def _adjust_patch_sf105(self, patch):
+    """
+    Original SF105.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'B3':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt1, 'NE')
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'C3':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'C2':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'F3':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'G3':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'A1':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'I1':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'I2':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'H1':
+        patch.adjust_corner(xpt2, 'NE')
+
+
+def _adjust_patch_sf135(self, patch):
+    """
+    Original SF135.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'B2':
+        patch.adjust_corner(xpt1, 'SE')
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'B1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'C2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'C1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'F1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'G1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'A3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'B3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'A2':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'I2':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'I3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'H3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt2, 'NE')
+
+
+def _adjust_patch_sf165(self, patch):
+    """
+    Original SF165.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'A2':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'B3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'E2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'E1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'F1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'G1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'H1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt1, 'SW')
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'H3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'I3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'I2':
+        patch.adjust_corner(xpt2, 'NW')
+
+
+def _adjust_patch_udn(self, patch):
+    """
+    Original UDN.AdjustPatch.
+    """
+    xpt1 = Point(self.LineTracer.NSEW_lookup['xpt1']['coor']['center'])
+    xpt2 = Point(self.LineTracer.NSEW_lookup['xpt2']['coor']['center'])
+
+    tag = patch.get_tag()
+    if tag == 'A2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'B2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'B1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'A1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'H1':
+        patch.adjust_corner(xpt1, 'NW')
+    elif tag == 'H2':
+        patch.adjust_corner(xpt1, 'SW')
+    elif tag == 'G2':
+        patch.adjust_corner(xpt1, 'SE')
+    elif tag == 'G1':
+        patch.adjust_corner(xpt1, 'NE')
+    elif tag == 'C3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'C2':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'D2':
+        patch.adjust_corner(xpt2, 'NW')
+    elif tag == 'D3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'E2':
+        patch.adjust_corner(xpt2, 'NE')
+    elif tag == 'E3':
+        patch.adjust_corner(xpt2, 'SE')
+    elif tag == 'F3':
+        patch.adjust_corner(xpt2, 'SW')
+    elif tag == 'F2':
+        patch.adjust_corner(xpt2, 'NW')
+
+
+class _RecordingPatch:
+    """
+    Stand-in Patch recording the corners snapped by AdjustPatch.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.adjusted = []
+
+    def get_tag(self):
+        return self.tag
+
+    def adjust_corner(self, point, corner):
+        self.adjusted.append(((point.x, point.y), corner))
+
+
+@pytest.mark.parametrize('Topology, config, reference', [
+    (SNL, 'LSN', _adjust_patch_snl),
+    (SF15, 'SF15', _adjust_patch_sf15),
+    (SF45, 'SF45', _adjust_patch_sf45),
+    (SF75, 'SF75', _adjust_patch_sf75),
+    (SF105, 'SF105', _adjust_patch_sf105),
+    (SF135, 'SF135', _adjust_patch_sf135),
+    (SF165, 'SF165', _adjust_patch_sf165),
+    (UDN, 'UDN', _adjust_patch_udn),
+])
+def test_xpt_corner_map_matches_adjust_patch_chain(Topology, config, reference):
+    NSEW_lookup = {'xpt1': {'coor': {'center': (1.1, -0.9)}}, 'xpt2': {'coor': {'center': (1.3, 0.8)}}}
+    session = SimpleNamespace(
+        settings={'grid_settings': {'grid_generation': {}}}, PlateData=None,
+        GetPatchTagMap=lambda config: {}, LineTracer=SimpleNamespace(NSEW_lookup=NSEW_lookup),
+        PsiUNorm=None, PsiNorm=None)
+    topology = Topology(session, config)
+
+    for tag in [letter + index for letter in 'ABCDEFGHI' for index in '123']:
+        patch, expected = _RecordingPatch(tag), _RecordingPatch(tag)
+        topology.AdjustPatch(patch)
+        reference(topology, expected)
+        assert patch.adjusted == expected.adjusted, tag
@@ -0,0 +1,250 @@
+import numpy as np
+import pytest
+from collections import OrderedDict, defaultdict
+from types import SimpleNamespace
+from INGRID.geometry import Point, Line, Cell, Patch
+from INGRID.utils import IngridUtils, TopologyUtils
+
+CONFIGS = {
+    # config: (num_xpt, patch letters, radial patch indices)
+    'LSN': (1, 'ABCDEF', '12'),
+    'SF45': (2, 'ABCDEFGHI', '123'),
+    'SF15': (2, 'ABCDEFGHI', '123'),
+    'UDN': (2, 'ABCDEFGH', '123'),
+}
+
+
+def _add_guardc_reference(cell_map, ixlb, ixrb, eps=1e-3):
+    """
+    Original guard cell padding of concat_grid.
+    """
+    def set_guard(cell_map, ix, iy, eps, boundary):
+        if boundary == 'left':
+            ixn = ix + 1
+            iyn = iy
+            cell_map[ix][iy][1] = cell_map[ixn][iyn][1] + eps * (cell_map[ixn][iyn][1] - cell_map[ixn][iyn][2])
+            cell_map[ix][iy][2] = cell_map[ixn][iyn][1]
+            cell_map[ix][iy][3] = cell_map[ixn][iyn][3] + eps * (cell_map[ixn][iyn][3] - cell_map[ixn][iyn][4])
+            cell_map[ix][iy][4] = cell_map[ixn][iyn][3]
+            cell_map[ix][iy][0] = 0.25 * (cell_map[ix][iy][1] + cell_map[ix][iy][2] + cell_map[ix][iy][3] + cell_map[ix][iy][4])
+
+        elif boundary == 'right':
+            ixn = ix - 1
+            iyn = iy
+            cell_map[ix][iy][2] = cell_map[ixn][iyn][2] + eps * (cell_map[ixn][iyn][2] - cell_map[ixn][iyn][1])
+            cell_map[ix][iy][1] = cell_map[ixn][iyn][2]
+            cell_map[ix][iy][4] = cell_map[ixn][iyn][4] + eps * (cell_map[ixn][iyn][4] - cell_map[ixn][iyn][3])
+            cell_map[ix][iy][3] = cell_map[ixn][iyn][4]
+            cell_map[ix][iy][0] = 0.25 * (cell_map[ix][iy][1] + cell_map[ix][iy][2] + cell_map[ix][iy][3] + cell_map[ix][iy][4])
+
+        elif boundary == 'bottom':
+            ixn = ix
+            iyn = iy + 1
+            cell_map[ix][iy][1] = cell_map[ixn][iyn][1] + eps * (cell_map[ixn][iyn][1] - cell_map[ixn][iyn][3])
+            cell_map[ix][iy][3] = cell_map[ixn][iyn][1]
+            cell_map[ix][iy][2] = cell_map[ixn][iyn][2] + eps * (cell_map[ixn][iyn][2] - cell_map[ixn][iyn][4])
+            cell_map[ix][iy][4] = cell_map[ixn][iyn][2]
+            cell_map[ix][iy][0] = 0.25 * (cell_map[ix][iy][1] + cell_map[ix][iy][2] + cell_map[ix][iy][3] + cell_map[ix][iy][4])
+
+        elif boundary == 'top':
+            ixn = ix
+            iyn = iy - 1
+            cell_map[ix][iy][3] = cell_map[ixn][iyn][3] + eps * (cell_map[ixn][iyn][3] - cell_map[ixn][iyn][1])
+            cell_map[ix][iy][1] = cell_map[ixn][iyn][3]
+            cell_map[ix][iy][4] = cell_map[ixn][iyn][4] + eps * (cell_map[ixn][iyn][4] - cell_map[ixn][iyn][2])
+            cell_map[ix][iy][2] = cell_map[ixn][iyn][4]
+            cell_map[ix][iy][0] = 0.25 * (cell_map[ix][iy][1] + cell_map[ix][iy][2] + cell_map[ix][iy][3] + cell_map[ix][iy][4])
+
+        return cell_map
+
+    np_ = len(cell_map) - 2
+    nr = len(cell_map[0]) - 2
+
+    for iy in range(1, nr + 1):
+        cell_map = set_guard(cell_map, ixlb, iy, eps, boundary='left')
+        cell_map = set_guard(cell_map, ixrb + 1, iy, eps, boundary='right')
+
+    for ix in range(np_ + 2):
+        cell_map = set_guard(cell_map, ix, 0, eps, boundary='bottom')
+        cell_map = set_guard(cell_map, ix, nr + 1, eps, boundary='top')
+
+    return cell_map
+
+
+def _concat_grid_reference(self):
+    """
+    Original concat_grid: per-cell copy loops into separate Fortran-order
+    rm/zm arrays, and a final concatenation for two x-points.
+
+    Returns the (rm, zm) arrays.
+    """
+    patch_matrix = self.patch_matrix
+
+    for patch in self.patches.values():
+        patch.npol = len(patch.cell_grid[0]) + 1
+        patch.nrad = len(patch.cell_grid) + 1
+
+    def fill(rm, zm, ixp_first, ixp_last, jyp_last):
+        for ixp in range(ixp_first, ixp_last):
+
+            nr_sum = 0
+            for jyp in range(1, jyp_last):
+                local_patch = patch_matrix[jyp][ixp]
+                nr_sum += local_patch.nrad - 1
+
+                for ixl in range(len(local_patch.cell_grid[0])):
+                    for jyl in range(len(local_patch.cell_grid)):
+
+                        ixcell = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][ixp_first:ixp + 1]])) \
+                            - len(local_patch.cell_grid[0]) + ixl + 1
+
+                        jycell = nr_sum - (local_patch.nrad - 1) + jyl + 1
+
+                        ind = 0
+                        for coor in ['CENTER', 'SW', 'SE', 'NW', 'NE']:
+                            rm[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].x
+                            zm[ixcell][jycell][ind] = local_patch.cell_grid[jyl][ixl].vertices[coor].y
+                            ind += 1
+
+        for i in range(len(rm)):
+            rm[i] = rm[i][::-1]
+        for i in range(len(zm)):
+            zm[i] = zm[i][::-1]
+
+        ixrb = len(rm) - 2
+        return _add_guardc_reference(rm, 0, ixrb), _add_guardc_reference(zm, 0, ixrb)
+
+    if self.parent.settings['grid_settings']['num_xpt'] == 1:
+
+        np_total = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][1:-1]])) + 2
+        nr_total = int(np.sum([patch[1].nrad - 1 for patch in patch_matrix[1:3]])) + 2
+
+        rm = np.zeros((np_total, nr_total, 5), order='F')
+        zm = np.zeros((np_total, nr_total, 5), order='F')
+        return fill(rm, zm, 1, 7, 3)
+
+    if self.config in ['SF45', 'SF75', 'SF105', 'SF135']:
+        pindex1, pindex2, pindex3 = 8, 10, 12
+    elif self.config in ['SF15', 'SF165']:
+        pindex1, pindex2, pindex3 = 7, 9, 12
+    elif self.config in ['UDN']:
+        pindex1, pindex2, pindex3 = 5, 7, 11
+
+    np_total1 = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][1:pindex1]])) + 2
+    nr_total1 = int(np.sum([patch[1].nrad - 1 for patch in patch_matrix[1:4]])) + 2
+    np_total2 = int(np.sum([patch.npol - 1 for patch in patch_matrix[1][pindex2:pindex3]])) + 2
+    nr_total2 = int(np.sum([patch[pindex2].nrad - 1 for patch in patch_matrix[1:4]])) + 2
+
+    rm1 = np.zeros((np_total1, nr_total1, 5), order='F')
+    zm1 = np.zeros((np_total1, nr_total1, 5), order='F')
+    rm2 = np.zeros((np_total2, nr_total2, 5), order='F')
+    zm2 = np.zeros((np_total2, nr_total2, 5), order='F')
+    rm1, zm1 = fill(rm1, zm1, 1, pindex1, 4)
+    rm2, zm2 = fill(rm2, zm2, pindex2, pindex3, 4)
+    return np.concatenate((rm1, rm2)), np.concatenate((zm1, zm2))
+
+
+def _refine(patch, npol_cells, nrad_cells, rng):
+    """
+    Give a Patch a cell grid of random vertices.
+    """
+    def point():
+        return Point(rng.uniform(1.0, 2.0), rng.uniform(-1.0, 1.0))
+
+    patch.cell_grid = []
+    for _ in range(nrad_cells):
+        row = []
+        for _ in range(npol_cells):
+            NW, NE, SW, SE = point(), point(), point(), point()
+            row.append(Cell([Line([NW, NE]), Line([SW, SE]), Line([NE, SE]), Line([NW, SW])]))
+        patch.cell_grid.append(row)
+
+
+def _topology(config, rng, npol=None, nrad=None):
+    """
+    A TopologyUtils holding refined Patches for every entry of the patch matrix.
+
+    npol maps a patch letter (column) and nrad a patch index (row) to a
+    number of cells; missing entries get a random number of cells.
+    """
+    num_xpt, letters, rows = CONFIGS[config]
+    npol = {**{letter: int(rng.integers(1, 5)) for letter in letters}, **(npol or {})}
+    nrad = {**{row: int(rng.integers(1, 4)) for row in rows}, **(nrad or {})}
+
+    topology = TopologyUtils.__new__(TopologyUtils)
+    topology.config = config
+    topology.parent = SimpleNamespace(settings={'grid_settings': {'num_xpt': num_xpt}})
+    topology.settings = {}
+    topology._concat_layouts = {}
+    topology.patches = OrderedDict()
+    for letter in letters:
+        for row in rows:
+            corners = [Point(0, 1), Point(1, 1), Point(1, 0), Point(0, 0)]
+            lines = [Line(corners[:2]), Line(corners[1:3]), Line(corners[2:]), Line([corners[3], corners[0]])]
+            patch = Patch(lines, patch_name=letter + row)
+            _refine(patch, npol[letter], nrad[row], rng)
+            topology.patches[letter + row] = patch
+    topology.SetupPatchMatrix()
+    return topology
+
+
+def _assert_matches_reference(topology):
+    rm, zm = _concat_grid_reference(topology)
+    topology.concat_grid()
+    np.testing.assert_array_equal(topology.rm, rm)
+    np.testing.assert_array_equal(topology.zm, zm)
+
+
+@pytest.mark.parametrize('config', list(CONFIGS))
+def test_concat_grid_matches_reference(config):
+    _assert_matches_reference(_topology(config, np.random.default_rng(6)))
+
+
+def test_concat_grid_rejects_mismatched_halves():
+    topology = _topology('SF45', np.random.default_rng(7), nrad={'1': 2})
+    _refine(topology.patches['H1'], 2, 3, np.random.default_rng(8))
+    _refine(topology.patches['I1'], 2, 3, np.random.default_rng(9))
+    with pytest.raises(AssertionError, match='same number of radial cells'):
+        topology.concat_grid()
+
+
+@pytest.mark.parametrize('config', list(CONFIGS))
+def test_concat_layout_reused_across_refinements(config):
+    rng = np.random.default_rng(10)
+    topology = _topology(config, rng, npol={'B': 2})
+    _assert_matches_reference(topology)
+    layouts = dict(topology._concat_layouts)
+
+    # Same cell counts, new vertices: the cached layout is reused.
+    for patch in topology.patches.values():
+        _refine(patch, len(patch.cell_grid[0]), len(patch.cell_grid), rng)
+    _assert_matches_reference(topology)
+    assert topology._concat_layouts == layouts
+
+    # A column refined differently needs a new layout.
+    for row in CONFIGS[config][2]:
+        _refine(topology.patches['B' + row], 3, len(topology.patches['B' + row].cell_grid), rng)
+    _assert_matches_reference(topology)
+    assert len(topology._concat_layouts) > len(layouts)
+
+
+@pytest.mark.parametrize('config', list(CONFIGS))
+def test_gridue_file_matches_reference(config, tmp_path):
+    # The vertex buffer is C-ordered now; the gridue writers must produce the
+    # same file as from the previous Fortran-ordered arrays.
+    topology = _topology(config, np.random.default_rng(11))
+    rm, zm = _concat_grid_reference(topology)
+    topology.concat_grid()
+    assert rm.flags.f_contiguous and not np.asarray(topology.rm).flags.f_contiguous
+
+    writer = IngridUtils.__new__(IngridUtils)
+    write = writer.WriteGridueSNL if CONFIGS[config][0] == 1 else writer.WriteGridueDNL
+    files = []
+    for name, (r, z) in {'new': (topology.rm, topology.zm), 'reference': (rm, zm)}.items():
+        gridue_settings = defaultdict(int, {'rm': r, 'zm': z})
+        for key in ['psi', 'br', 'bz', 'bpol', 'bphi', 'b']:
+            gridue_settings[key] = r
+        write(gridue_settings, str(tmp_path / name))
+        files.append((tmp_path / name).read_text())
+
+    assert files[0] == files[1]
@@ -0,0 +1,227 @@
+import numpy as np
+import pytest
+from scipy.optimize import fsolve
+from INGRID.geometry import Point, Line, Vector, intersect, segment_intersect, calc_mid_point, \
+    find_split_index, is_between
+
+
+def _intersect_reference(line1, line2):
+    """
+    Original fsolve formulation of intersect (non-vertical lines only).
+    """
+    def line(x, segment):
+        (x1, y1), (x2, y2) = segment
+        return (y2 - y1) / (x2 - x1) * (x - x1) + y1
+
+    (a, b), (c, d) = line1
+    (i, j), (p, q) = line2
+    guess = (np.mean([a, c, i, p]), np.mean([b, d, j, q]))
+    sol = fsolve(lambda xy: np.array([xy[1] - line(xy[0], line1), xy[1] - line(xy[0], line2)]), guess)
+    return sol[0], sol[1]
+
+
+def _segment_intersect_reference(line1, line2):
+    """
+    Original np.linalg.solve formulation of segment_intersect.
+    """
+    (xa, ya), (xb, yb) = line1
+    for i in range(len(line2) - 1):
+        (xc, yc), (xd, yd) = line2[i], line2[i + 1]
+        M = np.array([[xb - xa, -xd + xc], [yb - ya, -yd + yc]])
+        r = np.array([xc - xa, yc - ya])
+        try:
+            sol = np.linalg.solve(M, r)
+        except np.linalg.LinAlgError:
+            continue
+        if (sol[0] <= 1) and (sol[1] <= 1) and (sol[0] >= 0) and (sol[1] >= 0):
+            return True, [(xc, yc), (xc + sol[1] * (xd - xc), yc + sol[1] * (yd - yc))]
+    return False, [(np.nan, np.nan), (np.nan, np.nan)]
+
+
+def _calc_mid_point_reference(v1, v2):
+    """
+    Original per-quadrant formulation of calc_mid_point (off-axis v1 only).
+    """
+    theta = np.arccos(np.dot(v1.arr(), v2.arr()) / (v1.mag() * v2.mag())) / 2.
+    quadrant = (np.sign(v1.xnorm), np.sign(v1.ynorm))
+    if quadrant == (1, 1):
+        angle = np.arccos(v1.xnorm / v1.mag())
+    elif quadrant == (-1, 1):
+        angle = np.pi - np.arcsin(v1.ynorm / v1.mag())
+    elif quadrant == (-1, -1):
+        angle = np.pi + np.arctan(v1.ynorm / v1.xnorm)
+    elif quadrant == (1, -1):
+        angle = - np.arccos(v1.xnorm / v1.mag())
+    x = v1.xorigin + v1.mag() * np.cos(theta + angle)
+    y = v1.yorigin + v1.mag() * np.sin(theta + angle)
+    return x, y
+
+
+def _find_split_index_reference(split_point, line):
+    """
+    Original per-segment loop formulation of find_split_index.
+    """
+    for i in range(len(line.p) - 1):
+        if line.p[i].y == split_point.y and line.p[i].x == split_point.x:
+            return i, True
+        end_u = np.array([line.p[i + 1].x - line.p[i].x, line.p[i + 1].y - line.p[i].y])
+        split_v = np.array([split_point.x - line.p[i].x, split_point.y - line.p[i].y])
+        if is_between(end_u, split_v):
+            return i, False
+    return None, False
+
+
+class TestIntersect:
+
+    def test_crossing_lines(self):
+        assert intersect(((0, 0), (1, 1)), ((0, 1), (1, 0))) == pytest.approx((0.5, 0.5))
+
+    def test_intersection_outside_segments(self):
+        # intersect works on the infinite lines through the segments.
+        assert intersect(((0, 0), (1, 0)), ((3, 1), (3, 2))) == pytest.approx((3.0, 0.0))
+
+    @pytest.mark.parametrize('line1, line2, expected', [
+        (((0, 0), (0, 1)), ((-1, 0.5), (1, 0.5)), (0.0, 0.5)),
+        (((-1, 0.5), (1, 0.5)), ((0.25, -3), (0.25, 3)), (0.25, 0.5)),
+        (((2, -1), (2, 1)), ((0, 0), (1, 1)), (2.0, 2.0)),
+    ])
+    def test_vertical_lines(self, line1, line2, expected):
+        assert intersect(line1, line2) == pytest.approx(expected)
+
+    def test_skips_parallel_segments(self):
+        line2 = Line([Point(0, 1), Point(1, 1), Point(2, 3)])
+        assert intersect(((0, 0), (1, 0)), line2) == pytest.approx((0.5, 0.0))
+
+    def test_all_segments_parallel(self):
+        x, y = intersect(((0, 0), (1, 0)), ((0, 1), (1, 1)))
+        assert np.isnan(x) and np.isnan(y)
+
+    def test_collinear_segments(self):
+        x, y = intersect(((0, 0), (1, 1)), ((2, 2), (3, 3)))
+        assert np.isnan(x) and np.isnan(y)
+
+    def test_matches_fsolve(self):
+        rng = np.random.default_rng(3)
+        for _ in range(500):
+            line1 = [tuple(p) for p in rng.random((2, 2))]
+            line2 = [tuple(p) for p in rng.random((2, 2))]
+            slopes = [(l[1][1] - l[0][1]) / (l[1][0] - l[0][0]) for l in (line1, line2)]
+            if abs(np.arctan(slopes[0]) - np.arctan(slopes[1])) < 0.1:
+                continue
+            assert intersect(line1, line2) == pytest.approx(_intersect_reference(line1, line2), rel=1e-6, abs=1e-9)
+
+
+class TestSegmentIntersect:
+
+    def test_crossing_segments(self):
+        hit, segment = segment_intersect(((0, 0), (1, 1)), ((0, 1), (1, 0)))
+        assert hit
+        assert segment[0] == (0, 1)
+        assert segment[1] == pytest.approx((0.5, 0.5))
+
+    def test_disjoint_segments(self):
+        hit, segment = segment_intersect(((0, 0), (1, 1)), ((2, 0), (3, -1)))
+        assert not hit
+        assert np.all(np.isnan(segment))
+
+    def test_parallel_segments(self):
+        hit, _ = segment_intersect(((0, 0), (1, 0)), ((0, 1), (1, 1)))
+        assert not hit
+
+    def test_vertical_segments(self):
+        hit, segment = segment_intersect(((0.5, -1), (0.5, 1)), ((0, 0), (1, 0)))
+        assert hit
+        assert segment[1] == pytest.approx((0.5, 0.0))
+
+    def test_touching_endpoint(self):
+        hit, segment = segment_intersect(((0, 0), (1, 0)), ((1, 0), (1, 1)))
+        assert hit
+        assert segment[1] == pytest.approx((1.0, 0.0))
+
+    def test_first_crossing_segment_of_line(self):
+        line2 = Line([Point(-1, 2), Point(1, 2), Point(1, -1), Point(-1, -1)])
+        hit, segment = segment_intersect(((0, 0), (2, 0)), line2)
+        assert hit
+        assert segment[0] == (1.0, 2.0)
+        assert segment[1] == pytest.approx((1.0, 0.0))
+
+    def test_matches_linalg_solve(self):
+        rng = np.random.default_rng(0)
+        for _ in range(2000):
+            line1 = [tuple(p) for p in rng.random((2, 2))]
+            line2 = [tuple(p) for p in rng.random((rng.integers(2, 6), 2))]
+            hit, segment = segment_intersect(line1, line2)
+            ref_hit, ref_segment = _segment_intersect_reference(line1, line2)
+            assert hit == ref_hit
+            if hit:
+                np.testing.assert_allclose(segment, ref_segment, rtol=0, atol=1e-12)
+
+
+class TestCalcMidPoint:
+
+    @pytest.mark.parametrize('v1, v2, expected', [
+        ((1, 0), (0, 1), (np.sqrt(0.5), np.sqrt(0.5))),
+        ((0, 1), (-1, 0), (-np.sqrt(0.5), np.sqrt(0.5))),
+        ((-1, 0), (0, -1), (-np.sqrt(0.5), -np.sqrt(0.5))),
+        ((0, -1), (1, 0), (np.sqrt(0.5), -np.sqrt(0.5))),
+        ((2, 0), (-2, 0), (0.0, 2.0)),
+    ])
+    def test_on_axis_vectors(self, v1, v2, expected):
+        x, y = calc_mid_point(Vector(v1, (0, 0)), Vector(v2, (0, 0)))
+        assert (x, y) == pytest.approx(expected, abs=1e-12)
+
+    def test_shifted_origin(self):
+        origin = (1.5, -0.5)
+        v1 = Vector((origin[0] + 1, origin[1]), origin)
+        v2 = Vector((origin[0], origin[1] + 1), origin)
+        x, y = calc_mid_point(v1, v2)
+        assert (x, y) == pytest.approx((origin[0] + np.sqrt(0.5), origin[1] + np.sqrt(0.5)))
+
+    def test_bisects_in_every_quadrant(self):
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            origin = rng.normal(size=2)
+            a, b = rng.normal(size=2), rng.normal(size=2)
+            x, y = calc_mid_point(Vector(a + origin, origin), Vector(b + origin, origin))
+            m = np.array([x, y]) - origin
+            # The result lies on the circle of radius |v1| ...
+            assert np.hypot(*m) == pytest.approx(np.hypot(*a))
+            # ... at half the angle between v1 and v2, counter clockwise from v1.
+            half = np.arccos(np.dot(a, b) / (np.hypot(*a) * np.hypot(*b))) / 2
+            c, s = np.cos(half), np.sin(half)
+            expected = np.array([c * a[0] - s * a[1], s * a[0] + c * a[1]])
+            np.testing.assert_allclose(m, expected, atol=1e-9)
+
+    def test_matches_quadrant_formula(self):
+        rng = np.random.default_rng(4)
+        for _ in range(200):
+            origin = rng.normal(size=2)
+            v1 = Vector(rng.normal(size=2) + origin, origin)
+            v2 = Vector(rng.normal(size=2) + origin, origin)
+            assert calc_mid_point(v1, v2) == pytest.approx(_calc_mid_point_reference(v1, v2), abs=1e-12)
+
+
+class TestFindSplitIndex:
+
+    line = Line([Point(0, 0), Point(1, 0), Point(1, 1), Point(2, 1)])
+
+    def test_on_vertex(self):
+        assert find_split_index(Point(1, 0), self.line) == (1, True)
+
+    def test_inside_segment(self):
+        assert find_split_index(Point(1, 0.5), self.line) == (1, False)
+
+    def test_off_line(self):
+        assert find_split_index(Point(0.5, 0.5), self.line) == (None, False)
+
+    def test_matches_loop(self):
+        rng = np.random.default_rng(2)
+        pts = [Point(*p) for p in np.cumsum(rng.random((30, 2)), axis=0)]
+        line = Line(pts)
+        candidates = [pts[5], pts[-1], Point(0, 0)]
+        for i in (0, 7, 20):
+            t = rng.random()
+            candidates.append(Point(pts[i].x + t * (pts[i + 1].x - pts[i].x),
+                                    pts[i].y + t * (pts[i + 1].y - pts[i].y)))
+        for split_point in candidates:
+            assert find_split_index(split_point, line) == _find_split_index_reference(split_point, line)
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+import scipy.optimize
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from scipy.ndimage import zoom
+from INGRID.interpol import EfitData
+
+
+@pytest.fixture
+def saddle():
+    """
+    EfitData holding psi = (r - 1.5)**2 - (z - 0.1)**2, an x-point at (1.5, 0.1).
+    """
+    efit = EfitData(rmin=1.0, rmax=2.0, nr=65, zmin=-1.0, zmax=1.0, nz=129)
+    r = np.linspace(efit.rmin, efit.rmax, efit.nr)
+    z = np.linspace(efit.zmin, efit.zmax, efit.nz)
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    efit.init_bivariate_spline(r, z, (rr - 1.5)**2 - (zz - 0.1)**2)
+    return efit
+
+
+@pytest.fixture
+def well():
+    """
+    EfitData holding a Gaussian well centred at (1.4, -0.2), a magnetic axis.
+    """
+    efit = EfitData(rmin=1.0, rmax=2.0, nr=65, zmin=-1.0, zmax=1.0, nz=129)
+    r = np.linspace(efit.rmin, efit.rmax, efit.nr)
+    z = np.linspace(efit.zmin, efit.zmax, efit.nz)
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    efit.init_bivariate_spline(r, z, -np.exp(-((rr - 1.4)**2 + 0.5 * (zz + 0.2)**2) / 0.2) + 0.1 * rr * zz)
+    return efit
+
+
+@pytest.fixture
+def root_calls(monkeypatch):
+    calls = []
+    root = scipy.optimize.root
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return root(*args, **kwargs)
+
+    monkeypatch.setattr(scipy.optimize, 'root', spy)
+    return calls
+
+
+def test_newton_converges_without_root(saddle, root_calls):
+    r, z = saddle.FindCriticalPoint((1.42, 0.23))
+    assert (r, z) == pytest.approx((1.5, 0.1), abs=1e-8)
+    assert root_calls == []
+
+
+@pytest.mark.parametrize('guess', [(1.3, -0.1), (1.5, -0.35), (1.42, -0.18)])
+def test_matches_root(well, guess):
+    # Previously the critical points were refined with root on the gradient alone.
+    sol = scipy.optimize.root(well.Gradient, guess)
+    assert well.FindCriticalPoint(guess) == pytest.approx((sol.x[0], sol.x[1]), abs=1e-8)
+
+
+def test_falls_back_to_root(saddle, root_calls):
+    r, z = saddle.FindCriticalPoint((1.42, 0.23), maxiter=0)
+    assert len(root_calls) == 1
+    assert (r, z) == pytest.approx((1.5, 0.1), abs=1e-8)
+
+
+def test_falls_back_to_root_on_singular_hessian(saddle, root_calls, monkeypatch):
+    hessian = saddle.Hessian
+    first = []
+
+    def singular_once(xy):
+        if not first:
+            first.append(xy)
+            return np.zeros((2, 2))
+        return hessian(xy)
+
+    monkeypatch.setattr(saddle, 'Hessian', singular_once)
+    r, z = saddle.FindCriticalPoint((1.42, 0.23))
+    assert len(root_calls) == 1
+    assert (r, z) == pytest.approx((1.5, 0.1), abs=1e-8)
+
+
+@pytest.fixture
+def axes():
+    fig, ax = plt.subplots()
+    yield ax
+    plt.close('all')
+
+
+def _visible(ax):
+    return [c for c in ax.collections if c.get_visible()]
+
+
+def _contour_reference(efit, level, refine_factor=10):
+    """
+    Original PlotLevel contour of the zoomed EFIT grid, drawn on its own figure.
+    """
+    data = zoom(input=efit.v, zoom=refine_factor)
+    rgrid, zgrid = np.meshgrid(np.linspace(efit.rmin, efit.rmax, data.shape[0]),
+                               np.linspace(efit.zmin, efit.zmax, data.shape[1]),
+                               indexing='ij')
+    fig, ax = plt.subplots()
+    segments = ax.contour(rgrid, zgrid, data, [float(level)]).allsegs[0]
+    plt.close(fig)
+    return segments
+
+
+@pytest.mark.parametrize('level', [0.05, 0.3])
+def test_plot_level_matches_contour(saddle, axes, level):
+    saddle.PlotLevel(level, label='psi_core')
+    segments = saddle.psi_levels['psi_core'].allsegs[0]
+    reference = _contour_reference(saddle, level)
+    assert len(segments) == len(reference)
+    for segment, expected in zip(segments, reference):
+        np.testing.assert_array_equal(segment, expected)
+
+
+def test_plot_level_skips_unchanged_level(saddle, axes):
+    saddle.PlotLevel(0.05, color='blue', label='psi_core')
+    contour = saddle.psi_levels['psi_core']
+    saddle.PlotLevel(0.05, color='blue', label='psi_core')
+    assert saddle.psi_levels['psi_core'] is contour
+    assert len(_visible(axes)) == 1
+
+
+@pytest.mark.parametrize('change', [{'level': 0.3}, {'color': 'red'}, {'linestyles': 'dashed'}])
+def test_plot_level_redraws_changed_level(saddle, axes, change):
+    settings = {'level': 0.05, 'color': 'blue', 'linestyles': 'solid'}
+    saddle.PlotLevel(label='psi_core', **settings)
+    contour = saddle.psi_levels['psi_core']
+    saddle.PlotLevel(label='psi_core', **{**settings, **change})
+    assert saddle.psi_levels['psi_core'] is not contour
+    assert len(_visible(axes)) == 1
+    np.testing.assert_array_equal(saddle.psi_levels['psi_core'].allsegs[0][0],
+                                  _contour_reference(saddle, change.get('level', 0.05))[0])
+
+
+def test_plot_level_redraws_on_new_axes(saddle, axes):
+    saddle.PlotLevel(0.05, label='psi_core')
+    fig, ax = plt.subplots()
+    saddle.PlotLevel(0.05, label='psi_core')
+    assert saddle.psi_levels['psi_core'].axes is ax
+    assert len(_visible(ax)) == 1
+
+
+def test_plot_level_redraws_after_new_psi_data(saddle, axes):
+    saddle.PlotLevel(0.05, label='psi_core')
+    contour = saddle.psi_levels['psi_core']
+    r = np.linspace(saddle.rmin, saddle.rmax, saddle.nr)
+    z = np.linspace(saddle.zmin, saddle.zmax, saddle.nz)
+    saddle.init_bivariate_spline(r, z, 2 * saddle.v)
+    saddle.PlotLevel(0.05, label='psi_core')
+    assert saddle.psi_levels['psi_core'] is not contour
+    np.testing.assert_array_equal(saddle.psi_levels['psi_core'].allsegs[0][0],
+                                  _contour_reference(saddle, 0.05)[0])
+
+
+def test_plot_level_failed_contour_is_redrawn(saddle, axes):
+    saddle.PlotLevel(0.05, label='psi_core')
+    with pytest.raises(ValueError):
+        saddle.PlotLevel(0.3, color='not-a-color', label='psi_core')
+    assert 'psi_core' not in saddle._psi_level_keys
+    saddle.PlotLevel(0.05, label='psi_core')
+    assert len(_visible(axes)) == 1
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from INGRID.interpol import EfitData
+from INGRID.line_tracing import LineTracing
+from INGRID.geometry import Point, Line
+
+
+SETTINGS = {'integrator_settings': {'step_ratio': 0.02}}
+
+
+@pytest.fixture
+def well():
+    efit = EfitData(rmin=1.0, rmax=2.0, nr=65, zmin=-1.0, zmax=1.0, nz=129)
+    r = np.linspace(efit.rmin, efit.rmax, efit.nr)
+    z = np.linspace(efit.zmin, efit.zmax, efit.nz)
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    efit.init_bivariate_spline(r, z, (rr - 1.5)**2 + (zz - 0.1)**2)
+    return efit
+
+
+def _coordinates(line):
+    return np.array([p.coor for p in line.p])
+
+
+TARGETS = [
+    pytest.param((1.6, 0.1), {'psi': 0.15}, 'rho', id='psi'),
+    pytest.param((1.8, 0.1), {'point': (1.5, 0.4)}, 'theta', id='point'),
+    pytest.param((1.8, 0.1), {'line': Line([Point(1.5, 0.1), Point(1.5, 0.8)])}, 'theta', id='line'),
+]
+
+
+@pytest.mark.parametrize('start, target, option', TARGETS)
+def test_cached_trace_matches_fresh_trace(well, start, target, option):
+    tracer = LineTracing(well, SETTINGS, option='theta', direction='cw')
+    first = tracer.draw_line(start, target, option=option, direction='ccw')
+    assert len(tracer.line_cache) == 1
+    repeat = tracer.draw_line(start, target, option=option, direction='ccw')
+    assert len(tracer.line_cache) == 1
+
+    # An empty cache traces the line from scratch, as draw_line always did.
+    fresh = LineTracing(well, SETTINGS, option='theta', direction='cw')
+    uncached = fresh.draw_line(start, target, option=option, direction='ccw')
+
+    np.testing.assert_array_equal(_coordinates(first), _coordinates(uncached))
+    np.testing.assert_array_equal(_coordinates(repeat), _coordinates(uncached))
+
+
+def test_cached_trace_is_a_copy(well):
+    tracer = LineTracing(well, SETTINGS, option='theta', direction='cw')
+    first = tracer.draw_line((1.6, 0.1), {'psi': 0.15}, option='rho', direction='ccw')
+    expected = _coordinates(first)
+    first.p.clear()
+
+    repeat = tracer.draw_line((1.6, 0.1), {'psi': 0.15}, option='rho', direction='ccw')
+    np.testing.assert_array_equal(_coordinates(repeat), expected)
+    repeat.p.clear()
+    again = tracer.draw_line((1.6, 0.1), {'psi': 0.15}, option='rho', direction='ccw')
+    np.testing.assert_array_equal(_coordinates(again), expected)
+
+
+def test_distinct_requests_are_not_shared(well):
+    requests = [
+        ((1.6, 0.1), {'psi': 0.15}, {'option': 'rho', 'direction': 'ccw'}),
+        ((1.6, 0.1), {'psi': 0.2}, {'option': 'rho', 'direction': 'ccw'}),
+        ((1.6, 0.1), {'psi': 0.15}, {'option': 'rho', 'direction': 'ccw', 'dynamic_step': 1e-3}),
+        ((1.8, 0.1), {'point': (1.5, 0.4)}, {'option': 'theta', 'direction': 'ccw'}),
+        ((1.8, 0.1), {'point': (1.5, 0.4)}, {'option': 'theta', 'direction': 'ccw', 'dynamic_step': 1e-3}),
+    ]
+    tracer = LineTracing(well, SETTINGS, option='theta', direction='cw')
+    for start, target, kwargs in requests:
+        tracer.draw_line(start, target, **kwargs)
+    assert len(tracer.line_cache) == len(requests)
+
+    for start, target, kwargs in requests:
+        fresh = LineTracing(well, SETTINGS, option='theta', direction='cw')
+        np.testing.assert_array_equal(_coordinates(tracer.draw_line(start, target, **kwargs)),
+                                      _coordinates(fresh.draw_line(start, target, **kwargs)))
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from scipy.interpolate import splprep, splev
+import INGRID.geometry
+from INGRID.interpol import EfitData
+from INGRID.line_tracing import LineTracing
+from INGRID.geometry import Point, Line, Patch
+
+
+CENTER = (1.5, 0.1)
+THETA_W, THETA_E = np.radians(150), np.radians(30)
+
+
+def _psi_map(stretch=1.0):
+    efit = EfitData(rmin=1.0, rmax=2.0, nr=65, zmin=-1.0, zmax=1.0, nz=129)
+    r = np.linspace(efit.rmin, efit.rmax, efit.nr)
+    z = np.linspace(efit.zmin, efit.zmax, efit.nz)
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    efit.init_bivariate_spline(r, z, (rr - CENTER[0])**2 + stretch * (zz - CENTER[1])**2)
+    return efit
+
+
+def _grid(psi_map):
+    tracer = LineTracing(psi_map, {'integrator_settings': {'step_ratio': 0.02}}, option='theta', direction='cw')
+    return SimpleNamespace(PsiNorm=psi_map, LineTracer=tracer)
+
+
+def _arc(radius, theta_start, theta_end, n=12):
+    return Line([Point(CENTER[0] + radius * np.cos(t), CENTER[1] + radius * np.sin(t))
+                 for t in np.linspace(theta_start, theta_end, n)])
+
+
+def _leg(theta, radius_start, radius_end, n=6):
+    return Line([Point(CENTER[0] + r * np.cos(theta), CENTER[1] + r * np.sin(theta))
+                 for r in np.linspace(radius_start, radius_end, n)])
+
+
+def _patch(plate_patch=False, theta_e=THETA_E):
+    """
+    Annular patch between the psi surfaces of radius 0.2 (S) and 0.3 (N).
+    As a plate patch, the W leg overshoots both surfaces like a target plate.
+    """
+    W = _leg(THETA_W, 0.15, 0.35, n=9) if plate_patch else _leg(THETA_W, 0.2, 0.3)
+    lines = [_arc(0.3, THETA_W, theta_e), _leg(theta_e, 0.3, 0.2), _arc(0.2, theta_e, THETA_W), W]
+    patch = Patch(lines, patch_name='IDL', plate_patch=plate_patch, plate_location='W' if plate_patch else None)
+    patch.distortion_correction = {'active': False}
+    return patch
+
+
+def _vertices(patch):
+    return np.array([[[v.coor for v in cell.vertices.values()] for cell in row] for row in patch.cell_grid])
+
+
+@pytest.mark.parametrize('plate_patch', [False, True])
+def test_refining_again_matches_a_fresh_patch(plate_patch):
+    psi_map = _psi_map()
+    patch = _patch(plate_patch)
+    patch.make_subgrid(_grid(psi_map), 4, 3)
+    cached_splines = patch._boundary_splines
+    assert cached_splines is not None
+
+    for np_cells, nr_cells in [(4, 3), (6, 2)]:
+        patch.make_subgrid(_grid(psi_map), np_cells, nr_cells)
+        assert patch._boundary_splines is cached_splines
+
+        fresh = _patch(plate_patch)
+        fresh.make_subgrid(_grid(psi_map), np_cells, nr_cells)
+        np.testing.assert_array_equal(_vertices(patch), _vertices(fresh))
+
+
+def test_new_psi_map_refits_the_boundary():
+    patch = _patch()
+    patch.make_subgrid(_grid(_psi_map()), 4, 3)
+    before = _vertices(patch)
+
+    # An equal but reloaded psi map is a different object, and a stretched
+    # one moves the psi parameterization of the E and W legs.
+    stretched = _psi_map(stretch=1.5)
+    patch.make_subgrid(_grid(stretched), 4, 3)
+    assert patch._boundary_splines[0] is stretched
+
+    fresh = _patch()
+    fresh.make_subgrid(_grid(stretched), 4, 3)
+    np.testing.assert_array_equal(_vertices(patch), _vertices(fresh))
+    assert not np.allclose(_vertices(patch), before)
+
+
+def test_moved_boundary_refits_the_boundary():
+    psi_map = _psi_map()
+    patch = _patch()
+    patch.make_subgrid(_grid(psi_map), 4, 3)
+
+    moved = _patch(theta_e=np.radians(40))
+    patch.N, patch.E, patch.S = moved.N, moved.E, moved.S
+    patch.make_subgrid(_grid(psi_map), 4, 3)
+
+    moved.make_subgrid(_grid(psi_map), 4, 3)
+    np.testing.assert_array_equal(_vertices(patch), _vertices(moved))
+
+
+@pytest.mark.parametrize('plate_patch', [False, True])
+def test_interpolating_splines_match_splprep(plate_patch, monkeypatch):
+    fits = []
+    make_interp_spline = INGRID.geometry.make_interp_spline
+
+    def recording_make_interp_spline(u, xy, k):
+        fits.append((np.array(u), np.array(xy)))
+        return make_interp_spline(u, xy, k=k)
+
+    monkeypatch.setattr(INGRID.geometry, 'make_interp_spline', recording_make_interp_spline)
+    patch = _patch(plate_patch)
+    patch.make_subgrid(_grid(_psi_map()), 4, 3)
+
+    # N, S, the trimmed plate and then the two interior radial lines.
+    assert len(fits) == (5 if plate_patch else 4)
+    fitted = [patch.N_spl, patch.S_spl] + ([patch.W_spl] if plate_patch else []) + patch.radial_spl
+    for (u, xy), tck in zip(fits, fitted):
+        reference, _ = splprep([xy[:, 0], xy[:, 1]], u=u, s=0)
+        between = (u[1:] + u[:-1]) / 2
+        for samples in (u, between):
+            np.testing.assert_allclose(splev(samples, tck), splev(samples, reference), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(np.transpose(splev(u, tck)), xy, rtol=0, atol=1e-12)
+        assert all(c.flags['C_CONTIGUOUS'] for c in tck[1])
+
+
+def test_repeated_boundary_points_are_rejected_like_splprep():
+    patch = _patch()
+    N = patch.N.p
+    patch.N = Line(N[:5] + [N[4]] + N[5:])
+    with pytest.raises(ValueError):
+        patch.make_subgrid(_grid(_psi_map()), 4, 3)
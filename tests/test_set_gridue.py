@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from collections import defaultdict
+from types import SimpleNamespace
+from INGRID.interpol import EfitData
+from INGRID.topologies.snl import SNL
+from INGRID.topologies.sf15 import SF15
+from INGRID.topologies.sf45 import SF45
+from INGRID.topologies.sf75 import SF75
+from INGRID.topologies.sf105 import SF105
+from INGRID.topologies.sf135 import SF135
+from INGRID.topologies.sf165 import SF165
+from INGRID.topologies.udn import UDN
+
+
+def _set_gridue_fields_reference(PsiUNorm, rm, zm):
+    """
+    Original per-vertex loop of set_gridue over scalar get_psi calls.
+    (get_psi returns 1-element arrays, hence the np.ravel.)
+    """
+    psi = np.zeros(rm.shape, order='F')
+    br = np.zeros(rm.shape, order='F')
+    bz = np.zeros(rm.shape, order='F')
+    bpol = np.zeros(rm.shape, order='F')
+    bphi = np.zeros(rm.shape, order='F')
+    b = np.zeros(rm.shape, order='F')
+    rb_prod = PsiUNorm.rcenter * PsiUNorm.bcenter
+
+    for i in range(len(b)):
+        for j in range(len(b[0])):
+            for k in range(5):
+                _r = rm[i][j][k]
+                _z = zm[i][j][k]
+
+                _psi = np.ravel(PsiUNorm.get_psi(_r, _z))[0]
+                _br = np.ravel(PsiUNorm.get_psi(_r, _z, tag='vz'))[0] / _r
+                _bz = -np.ravel(PsiUNorm.get_psi(_r, _z, tag='vr'))[0] / _r
+                _bpol = np.sqrt(_br ** 2 + _bz ** 2)
+                _bphi = rb_prod / _r
+                _b = np.sqrt(_bpol ** 2 + _bphi ** 2)
+
+                psi[i][j][k] = _psi
+                br[i][j][k] = _br
+                bz[i][j][k] = _bz
+                bpol[i][j][k] = _bpol
+                bphi[i][j][k] = _bphi
+                b[i][j][k] = _b
+
+    return {'psi': psi, 'br': br, 'bz': bz, 'bpol': bpol, 'bphi': bphi, 'b': b}
+
+
+@pytest.fixture
+def psi_map():
+    efit = EfitData(rmin=1.0, rmax=2.0, nr=33, zmin=-1.0, zmax=1.0, nz=65,
+                    rcenter=1.7, bcenter=-2.1)
+    r = np.linspace(efit.rmin, efit.rmax, efit.nr)
+    z = np.linspace(efit.zmin, efit.zmax, efit.nz)
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    efit.init_bivariate_spline(r, z, np.exp(-((rr - 1.5)**2 + (zz - 0.1)**2) / 0.3) + 0.2 * rr * zz**2)
+    return efit
+
+
+@pytest.mark.parametrize('Topology', [SNL, SF15, SF45, SF75, SF105, SF135, SF165, UDN])
+def test_set_gridue_matches_scalar_loop(Topology, psi_map):
+    rng = np.random.default_rng(5)
+    topology = Topology.__new__(Topology)
+    topology.PsiUNorm = psi_map
+    topology.patches = defaultdict(lambda: SimpleNamespace(npol=4, nrad=3))
+    topology.rm = rng.uniform(1.05, 1.95, size=(12, 7, 5))
+    topology.zm = rng.uniform(-0.95, 0.95, size=(12, 7, 5))
+
+    gridue_settings = topology.set_gridue()
+    expected = _set_gridue_fields_reference(psi_map, topology.rm, topology.zm)
+
+    for key, value in expected.items():
+        np.testing.assert_allclose(gridue_settings[key], value, rtol=1e-13, atol=1e-13, err_msg=key)